@@ -0,0 +1,214 @@
+"""
+Data Cleaning Utility - Benchmarks
+----------------------------------
+Timing scripts for the DataCleaningUtility cleaning steps.
+
+Usage:
+    python benchmark.py parallel [rows] [text_columns]
+    python benchmark.py steps [rows ...] [--columns N] [--save-baseline] [--baseline FILE]
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import argparse
+import contextlib
+import tracemalloc
+
+import pandas as pd
+
+from data_cleaning_utility import DataCleaningUtility, CleaningLogger, generate_dirty_data, generate_synthetic_data
+
+
+def quiet():
+    """Silence the print output of the cleaning steps while timing"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+# ============================================================================
+# COLUMN-PARALLEL BENCHMARK
+# ============================================================================
+
+def make_wide_frame(rows, text_columns):
+    """Tile the sample dirty data to `rows` rows and widen it with copies of its text columns"""
+    with quiet():
+        sample = generate_dirty_data()
+    reps = -(-rows // len(sample))
+    df = pd.concat([sample] * reps, ignore_index=True).iloc[:rows]
+
+    text = ['First Name', ' Last_Name ', 'Email Address', 'CITY', 'Member Status']
+    for i in range(text_columns):
+        source = text[i % len(text)]
+        df[f"{source.strip()} {i}"] = df[source]
+    for i in range(text_columns // 4):
+        df[f"Date {i}"] = df['Registration Date']
+    return df
+
+
+def run_steps(df, workers):
+    """Run the per-column steps and return (seconds, cleaner)"""
+    with quiet():
+        cleaner = DataCleaningUtility(df, lean=True, copy='cow', workers=workers)
+        start = time.perf_counter()
+        cleaner.handle_missing_values(strategy='smart')
+        cleaner.fix_data_types()
+        cleaner.standardize_text_data()
+        elapsed = time.perf_counter() - start
+    return elapsed, cleaner
+
+
+def benchmark_parallel(rows=1_000_000, text_columns=32, worker_counts=None):
+    """Compare serial and process-pool runs of the per-column cleaning steps"""
+    if worker_counts is None:
+        cores = os.cpu_count() or 1
+        worker_counts = [w for w in (1, 2, 4, 8, 16, 32, 64) if w <= cores] or [1]
+
+    df = make_wide_frame(rows, text_columns)
+    print(f"Frame: {df.shape[0]} rows x {df.shape[1]} columns, {os.cpu_count()} CPU cores")
+    print(f"{'Workers':>8} {'Seconds':>10} {'Speedup':>8}  Log matches serial")
+
+    serial_time, serial = run_steps(df, 1)
+    print(f"{1:>8} {serial_time:>10.2f} {1.0:>8.2f}  yes")
+    for workers in worker_counts:
+        if workers == 1:
+            continue
+        elapsed, cleaner = run_steps(df, workers)
+        same = (cleaner.cleaning_log[5:] == serial.cleaning_log[5:]
+                and cleaner.get_cleaned_data().equals(serial.get_cleaned_data()))
+        print(f"{workers:>8} {elapsed:>10.2f} {serial_time / elapsed:>8.2f}  {'yes' if same else 'NO'}")
+
+
+# ============================================================================
+# STEP BENCHMARK SUITE
+# ============================================================================
+
+BASELINE_FILE = 'benchmark_baseline.json'
+
+# The steps of main(), in order
+PIPELINE_STEPS = [
+    ('detect_missing_values', lambda c: c.detect_missing_values()),
+    ('handle_missing_values', lambda c: c.handle_missing_values(strategy='smart')),
+    ('fix_data_types', lambda c: c.fix_data_types()),
+    ('remove_duplicates', lambda c: c.remove_duplicates()),
+    ('standardize_column_names', lambda c: c.standardize_column_names()),
+    ('standardize_text_data', lambda c: c.standardize_text_data()),
+    ('optimize_memory', lambda c: c.optimize_memory()),
+    ('generate_report', lambda c: c.generate_report()),
+]
+
+
+def run_pipeline(df, trace_memory=False):
+    """
+    Run the main() cleaning steps on a copy of df
+    
+    Returns {step: {'seconds', 'peak_mb'}}, including a 'pipeline' total.
+    Peak traced memory is only measured with trace_memory=True, since
+    tracing slows the steps down.
+    """
+    results = {}
+    with quiet():
+        if trace_memory:
+            tracemalloc.start()
+        total_start = time.perf_counter()
+        cleaner = DataCleaningUtility(df, logger=CleaningLogger(echo=False))
+        for name, step in PIPELINE_STEPS:
+            if trace_memory:
+                tracemalloc.reset_peak()
+            start = time.perf_counter()
+            step(cleaner)
+            results[name] = {'seconds': time.perf_counter() - start}
+            if trace_memory:
+                results[name]['peak_mb'] = tracemalloc.get_traced_memory()[1] / 1024**2
+        results['pipeline'] = {'seconds': time.perf_counter() - total_start}
+        if trace_memory:
+            results['pipeline']['peak_mb'] = max(r['peak_mb'] for r in results.values() if 'peak_mb' in r)
+            tracemalloc.stop()
+    return results
+
+
+def benchmark_steps(sizes=(10_000, 100_000, 1_000_000), columns=10, baseline_file=BASELINE_FILE,
+                    save_baseline=False, tolerance=0.2, min_seconds=0.05, repeats=3):
+    """
+    Time each cleaning step and the whole pipeline on synthetic data of several sizes
+    
+    Parameters:
+    - sizes: Row counts to benchmark
+    - columns: Number of columns of the synthetic data
+    - baseline_file: JSON file of earlier results to compare against
+    - save_baseline: Store these results as the new baseline
+    - tolerance: Relative slowdown or memory growth reported as a regression
+    - min_seconds: Steps faster than this in the baseline are too noisy to compare
+    - repeats: Timing runs per size; the fastest run of each step is kept
+    
+    Returns the number of regressions.
+    """
+    baseline = {}
+    if os.path.exists(baseline_file) and not save_baseline:
+        with open(baseline_file) as f:
+            baseline = json.load(f)
+    
+    results = {}
+    regressions = 0
+    print(f"{'Rows':>10} {'Step':<26} {'Seconds':>9} {'Rows/s':>12} {'Peak MB':>9}  vs baseline")
+    for rows in sizes:
+        df = generate_synthetic_data(rows=rows, columns=columns)
+        runs = [run_pipeline(df) for _ in range(repeats)]
+        timings = {step: min(run[step]['seconds'] for run in runs) for step in runs[0]}
+        memory = run_pipeline(df, trace_memory=True)
+        
+        results[str(rows)] = {}
+        for step, seconds in timings.items():
+            result = {
+                'seconds': round(seconds, 4),
+                'rows_per_sec': round(rows / seconds) if seconds > 0 else None,
+                'peak_mb': round(memory[step]['peak_mb'], 2),
+            }
+            results[str(rows)][step] = result
+            
+            compare = ''
+            previous = baseline.get(str(rows), {}).get(step)
+            if previous:
+                time_ratio = seconds / previous['seconds'] if previous['seconds'] else 1.0
+                memory_ratio = result['peak_mb'] / previous['peak_mb'] if previous['peak_mb'] else 1.0
+                compare = f"time x{time_ratio:.2f}, memory x{memory_ratio:.2f}"
+                slower = previous['seconds'] >= min_seconds and time_ratio > 1 + tolerance
+                if slower or memory_ratio > 1 + tolerance:
+                    compare += '  REGRESSION'
+                    regressions += 1
+            print(f"{rows:>10} {step:<26} {seconds:>9.3f} {result['rows_per_sec'] or 0:>12,} "
+                  f"{result['peak_mb']:>9.1f}  {compare}")
+    
+    if save_baseline:
+        with open(baseline_file, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {baseline_file}")
+    elif not baseline:
+        print(f"\nNo baseline in {baseline_file}; run with --save-baseline to store one")
+    else:
+        print(f"\n{regressions} regression(s) beyond {tolerance:.0%}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for the data cleaning utility")
+    commands = parser.add_subparsers(dest='command')
+    
+    parallel = commands.add_parser('parallel', help="serial vs process-pool per-column steps")
+    parallel.add_argument('rows', nargs='?', type=int, default=1_000_000)
+    parallel.add_argument('text_columns', nargs='?', type=int, default=32)
+    
+    steps = commands.add_parser('steps', help="per-step time, throughput and peak memory")
+    steps.add_argument('rows', nargs='*', type=int, default=[10_000, 100_000, 1_000_000])
+    steps.add_argument('--columns', type=int, default=10)
+    steps.add_argument('--baseline', default=BASELINE_FILE)
+    steps.add_argument('--save-baseline', action='store_true')
+    steps.add_argument('--tolerance', type=float, default=0.2)
+    
+    args = parser.parse_args()
+    if args.command == 'steps':
+        sys.exit(1 if benchmark_steps(args.rows, args.columns, args.baseline,
+                                      args.save_baseline, args.tolerance) else 0)
+    else:
+        benchmark_parallel(getattr(args, 'rows', 1_000_000), getattr(args, 'text_columns', 32))
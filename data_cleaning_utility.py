@@ -15,6 +15,28 @@ Project: Week 1 - Data Cleaning Utility
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import json
+import gzip
+import hashlib
+import pickle
+import queue
+import threading
+from collections import Counter, deque
+import os
+import sys
+import glob
+import argparse
+import traceback
+import time
+import contextlib
+import functools
+import cProfile
+import pstats
+import tracemalloc
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -101,6 +123,531 @@ def generate_dirty_data():
     return df
 
 
+# Vocabularies for generate_synthetic_data, taken from the sample data
+FIRST_NAMES = ['John', 'Jane', 'Bob', 'Alice', 'Charlie', 'David', 'Emma', 'Frank', 'Grace', 'Henry',
+               'Ivy', 'Jack', 'Kate', 'Leo', 'Mia', 'Noah', 'Olivia', 'Paul', 'Quinn', 'Rose', 'Sam', 'Uma']
+LAST_NAMES = ['Doe', 'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
+              'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas',
+              'Taylor', 'Moore', 'Jackson', 'Lee', 'Walker', 'Hall', 'Allen', 'Young']
+CITIES = ['Lagos', 'Ibadan', 'Abuja', 'Port Harcourt', 'Kano']
+SAMPLE_DATE_FORMATS = ['%Y-%m-%d', '%Y/%m/%d', '%B %d, %Y', '%m/%d/%Y', '%m-%d-%Y']
+CORRUPT_AGES = ['thirty-five', 'unknown', 'forty', 'twenty-two']
+
+
+def make_vocabulary(base, cardinality):
+    """Distinct values: the base words first, then numbered variants of them"""
+    return [base[i % len(base)] if i < len(base) else f"{base[i % len(base)]} {i // len(base)}"
+            for i in range(cardinality)]
+
+
+def messy_text(rng, vocabulary, n, corruption_rate):
+    """Pick n values from a vocabulary with inconsistent capitalization and stray spaces"""
+    words = np.array(vocabulary, dtype=object)
+    variants = np.array([words,
+                         [w.lower() for w in words],
+                         [w.upper() for w in words]], dtype=object)
+    values = variants[rng.choice(3, size=n, p=[0.7, 0.15, 0.15]), rng.integers(len(words), size=n)]
+    padded = rng.random(n) < corruption_rate
+    values[padded] = ' ' + values[padded] + ' '
+    return values
+
+
+def synthetic_chunks(rows, columns, missing_rate, duplicate_rate, corruption_rate,
+                     date_formats, text_cardinality, seed, chunk_rows):
+    """Yield the chunks of a synthetic dirty dataset"""
+    rng = np.random.default_rng(seed)
+    first_names = make_vocabulary(FIRST_NAMES, text_cardinality)
+    last_names = make_vocabulary(LAST_NAMES, text_cardinality)
+    cities = make_vocabulary(CITIES, max(len(CITIES), text_cardinality // 10))
+    categories = make_vocabulary(['Category'], text_cardinality)
+    
+    # Every (format, day) string is rendered once and picked by index
+    days = pd.date_range('2020-01-01', '2024-12-31')
+    date_table = np.array([days.strftime(fmt) for fmt in date_formats], dtype=object)
+    
+    for start in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - start)
+        first = messy_text(rng, first_names, n, corruption_rate)
+        
+        age = rng.integers(18, 80, size=n).astype(str).astype(object)
+        corrupt = rng.random(n) < corruption_rate
+        age[corrupt] = rng.choice(CORRUPT_AGES, size=corrupt.sum())
+        
+        domain = np.where(rng.random(n) < corruption_rate, '@EMAIL.COM', '@email.com')
+        ids = np.arange(start + 1, start + n + 1)
+        email = (pd.Series(first).str.replace(' ', '').str.lower() + pd.Series(ids).astype(str) + domain).to_numpy()
+        
+        phone = rng.integers(0, 10**10, size=n)
+        phone = pd.Series(phone).astype(str).str.zfill(10)
+        phone = (phone.str[:3] + '-' + phone.str[3:6] + '-' + phone.str[6:]).to_numpy()
+        
+        data = {
+            'Customer ID': ids,
+            'First Name': first,
+            ' Last_Name ': messy_text(rng, last_names, n, corruption_rate),
+            'age': age,
+            'Email Address': email,
+            'Phone_Number': phone,
+            'Registration Date': date_table[rng.integers(len(date_formats), size=n), rng.integers(len(days), size=n)],
+            'Purchase_Amount': rng.uniform(10, 500, size=n).round(2),
+            'CITY': messy_text(rng, cities, n, corruption_rate),
+            'Member Status': messy_text(rng, ['Active', 'Inactive'], n, corruption_rate),
+        }
+        data = dict(list(data.items())[:columns])
+        for i in range(len(data), columns):
+            if i % 2 == 0:
+                data[f"Extra Text {i - 9}"] = messy_text(rng, categories, n, corruption_rate)
+            else:
+                data[f"Extra Amount {i - 9}"] = rng.uniform(0, 1000, size=n).round(2)
+        
+        # Missing values everywhere except the ID
+        for col, values in data.items():
+            if col == 'Customer ID':
+                continue
+            values[rng.random(n) < missing_rate] = np.nan
+        
+        # Duplicates repeat an earlier row of the same chunk
+        positions = np.flatnonzero(rng.random(n) < duplicate_rate)
+        positions = positions[positions > 0]
+        sources = (rng.random(len(positions)) * positions).astype(int)
+        for values in data.values():
+            values[positions] = values[sources]
+        
+        yield pd.DataFrame(data)
+
+
+def generate_synthetic_data(rows=100000, columns=10, missing_rate=0.05, duplicate_rate=0.02,
+                            corruption_rate=0.02, date_formats=None, text_cardinality=50,
+                            seed=42, output=None, chunk_rows=1000000):
+    """
+    Generate a dirty dataset of any size with the issues of generate_dirty_data
+    
+    Parameters:
+    - rows: Number of rows (generated in chunks of chunk_rows, up to 100M+)
+    - columns: Number of columns; past the 10 sample columns, extra text and
+      amount columns are added
+    - missing_rate: Fraction of missing values in every column but the ID
+    - duplicate_rate: Fraction of rows that repeat an earlier row
+    - corruption_rate: Fraction of ages written as words, emails with an
+      upper-case domain and text values with stray spaces
+    - date_formats: strftime formats mixed in 'Registration Date'
+      (default: the formats of the sample data)
+    - text_cardinality: Distinct names and categories before case variations
+    - output: None to return a DataFrame, or a .csv / .parquet path to stream
+      the chunks to (returns the path)
+    """
+    chunks = synthetic_chunks(rows, columns, missing_rate, duplicate_rate, corruption_rate,
+                              date_formats or SAMPLE_DATE_FORMATS, text_cardinality, seed, chunk_rows)
+    
+    if output is None:
+        return pd.concat(chunks, ignore_index=True)
+    
+    if output.endswith('.parquet'):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Writing Parquet requires pyarrow: pip install pyarrow")
+        writer = None
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False,
+                                         schema=writer.schema if writer else None)
+            if writer is None:
+                writer = pq.ParquetWriter(output, table.schema)
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+    else:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(output, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+    return output
+
+
+# ============================================================================
+# CLEANING LOG
+# ============================================================================
+
+LOG_LEVELS = {'summary': 0, 'detail': 1, 'debug': 2}
+
+
+class LogSink:
+    """
+    Buffered, asynchronous file destination for log records
+    
+    Records are queued and written by a background thread in batches of up
+    to buffer_size, so a cleaning step never waits on the disk. Subclasses
+    only define how a record is formatted.
+    """
+    
+    def __init__(self, filename, buffer_size=1000):
+        self.filename = filename
+        self.buffer_size = buffer_size
+        self.queue = queue.Queue()
+        self.file = open(filename, 'w', encoding='utf-8')
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        self.closed = False
+    
+    def format(self, record):
+        raise NotImplementedError
+    
+    def write(self, record):
+        """Queue one record (a dict with time, level and message)"""
+        self.queue.put(record)
+    
+    def run(self):
+        batch = []
+        while True:
+            record = self.queue.get()
+            if record is not None:
+                batch.append(self.format(record))
+            if batch and (record is None or len(batch) >= self.buffer_size or self.queue.empty()):
+                self.file.write(''.join(batch))
+                batch = []
+            if record is None:
+                break
+        self.file.close()
+    
+    def close(self):
+        """Flush every queued record and close the file"""
+        if not self.closed:
+            self.closed = True
+            self.queue.put(None)
+            self.thread.join()
+
+
+class TextLogSink(LogSink):
+    """Plain text log, one message per line (same layout as save_cleaning_log)"""
+    
+    def format(self, record):
+        return record['message'] + '\n'
+
+
+class JsonLinesLogSink(LogSink):
+    """Structured log, one JSON object per record"""
+    
+    def format(self, record):
+        return json.dumps(record, ensure_ascii=False, default=str) + '\n'
+
+
+class CleaningLogger:
+    """
+    Leveled front end for the cleaning log
+    
+    Messages are tagged 'summary' (step headers and row counts), 'detail'
+    (per-column actions and tables) or 'debug' (dtype listings). Anything
+    above the configured level is dropped before it is formatted: messages
+    may be passed as callables, and tables are only rendered when emitted,
+    truncated to max_table_rows. Emitted messages are kept in entries (the
+    last max_entries only, if set), echoed to stdout if echo is True, and
+    sent to every sink. While capture is a list, (message, level) pairs of
+    emitted messages are also appended to it, so they can be replayed.
+    """
+    
+    def __init__(self, level='debug', echo=True, sinks=None, max_entries=None, max_table_rows=50):
+        if level not in LOG_LEVELS:
+            raise ValueError(f"Unknown log level: {level}")
+        self.level = level
+        self.echo = echo
+        self.sinks = list(sinks or [])
+        self.entries = [] if max_entries is None else deque(maxlen=max_entries)
+        self.max_table_rows = max_table_rows
+        self.capture = None
+    
+    def enabled(self, level):
+        """True if messages of this level are emitted"""
+        return LOG_LEVELS[level] <= LOG_LEVELS[self.level]
+    
+    def log(self, message, level='summary'):
+        """Emit a message (or a callable returning one) if its level is enabled"""
+        if not self.enabled(level):
+            return
+        if callable(message):
+            message = message()
+        self.entries.append(message)
+        if self.capture is not None:
+            self.capture.append((message, level))
+        if self.echo:
+            print(message)
+        if self.sinks:
+            record = {'time': datetime.now().isoformat(timespec='milliseconds'),
+                      'level': level, 'message': message}
+            for sink in self.sinks:
+                sink.write(record)
+    
+    def log_table(self, df, level='detail', index=True):
+        """Emit a DataFrame rendered as text, truncated to max_table_rows"""
+        self.log(lambda: df.to_string(index=index, max_rows=self.max_table_rows), level)
+    
+    def close(self):
+        """Flush and close every sink"""
+        for sink in self.sinks:
+            sink.close()
+
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+
+PROFILE_MODES = {
+    'time': {},
+    'memory': {'memory': True},
+    'cprofile': {'cprofile': True},
+}
+
+
+class StepProfiler:
+    """
+    Per-step instrumentation of the cleaning steps
+    
+    Every step records wall and CPU time (CPU time of this process only,
+    not of column workers), rows and columns in and out, and the time of
+    each column handled by the column engine. With memory=True, tracemalloc
+    also records the peak memory above the step's starting point and the
+    net bytes still allocated when it ends (tracing slows the steps down).
+    With cprofile=True the steps run under cProfile, and the collected
+    stats can be printed or dumped for pstats/snakeviz.
+    """
+    
+    def __init__(self, memory=False, cprofile=False):
+        self.memory = memory
+        self.cprofile = cProfile.Profile() if cprofile else None
+        self.records = []
+    
+    @contextlib.contextmanager
+    def step(self, name, shape, engine=None):
+        """
+        Profile the block as one step
+        
+        Parameters:
+        - name: Step name
+        - shape: Callable returning the current (rows, columns)
+        - engine: ParallelColumnEngine whose column timings are collected
+        """
+        rows_in, columns_in = shape()
+        if engine is not None:
+            engine.column_times = []
+        started_tracing = False
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+        if self.cprofile is not None:
+            self.cprofile.enable()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            if self.cprofile is not None:
+                self.cprofile.disable()
+            record = {'step': name, 'wall_seconds': wall, 'cpu_seconds': cpu,
+                      'peak_bytes': None, 'allocated_bytes': None}
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record['peak_bytes'] = peak - memory_start
+                record['allocated_bytes'] = current - memory_start
+                if started_tracing:
+                    tracemalloc.stop()
+            rows_out, columns_out = shape()
+            record.update(rows_in=rows_in, rows_out=rows_out,
+                          columns_in=columns_in, columns_out=columns_out)
+            record['columns'] = []
+            if engine is not None:
+                record['columns'] = [{'column': col, 'seconds': seconds}
+                                     for col, seconds in engine.column_times]
+                engine.column_times = None
+            self.records.append(record)
+    
+    def to_frame(self):
+        """One row per profiled step"""
+        columns = ['step', 'wall_seconds', 'cpu_seconds', 'peak_bytes', 'allocated_bytes',
+                   'rows_in', 'rows_out', 'columns_in', 'columns_out']
+        return pd.DataFrame([{key: record[key] for key in columns} for record in self.records],
+                            columns=columns)
+    
+    def columns_frame(self):
+        """One row per (step, column) timed by the column engine"""
+        rows = [{'step': record['step'], **column}
+                for record in self.records for column in record['columns']]
+        return pd.DataFrame(rows, columns=['step', 'column', 'seconds'])
+    
+    def save(self, filename='cleaning_profile.json'):
+        """Export the step records (with their per-column breakdown) as JSON"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.records, f, indent=2, default=str)
+    
+    def print_stats(self, top=20, sort='cumulative'):
+        """Print the hottest functions collected by cProfile"""
+        if self.cprofile is None:
+            raise ValueError("cProfile is not enabled for this profiler")
+        pstats.Stats(self.cprofile).sort_stats(sort).print_stats(top)
+    
+    def dump_stats(self, filename='cleaning_profile.prof'):
+        """Write the cProfile stats for pstats or snakeviz"""
+        if self.cprofile is None:
+            raise ValueError("cProfile is not enabled for this profiler")
+        self.cprofile.dump_stats(filename)
+
+
+def make_profiler(profile):
+    """
+    StepProfiler for a profile setting: None (use the DATA_CLEANING_PROFILE
+    environment variable), False (off), True ('memory'), a mode name from
+    PROFILE_MODES, or a StepProfiler instance
+    """
+    if profile is None:
+        profile = os.environ.get('DATA_CLEANING_PROFILE') or False
+    if profile is True:
+        profile = 'memory'
+    if profile is False:
+        return None
+    if isinstance(profile, StepProfiler):
+        return profile
+    if profile not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {profile}")
+    return StepProfiler(**PROFILE_MODES[profile])
+
+
+def profiled_step(method):
+    """Run a DataCleaningUtility step under the cleaner's profiler, if any"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.profiler is None:
+            return method(self, *args, **kwargs)
+        with self.profiler.step(method.__name__, lambda: self.df.shape, self.engine):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+# ============================================================================
+# COLUMN PROFILE
+# ============================================================================
+
+class ColumnProfile:
+    """
+    Cached per-column facts of a DataFrame: null count, dtype, cardinality and memory
+    
+    Null counts and dtypes of all columns come from one vectorized pass.
+    Cardinality and memory need a scan of the column, so they are computed
+    on first use and kept. Steps tell the profile what they changed
+    (update, filled, retyped, filter_rows, rename) and only those facts are
+    recomputed.
+    If the frame is replaced by a different object (see sync), the profile
+    is rebuilt; edit the frame in place only through the cleaning steps,
+    or call refresh afterwards.
+    """
+    
+    def __init__(self, df):
+        self.refresh(df)
+    
+    def refresh(self, df):
+        """Profile every column of df from scratch"""
+        self.frame = weakref.ref(df)
+        self.rows = len(df)
+        self.nulls = {col: int(count) for col, count in df.isnull().sum().items()}
+        self.dtypes = dict(df.dtypes.items())
+        self.scanned = {}  # col -> {'cardinality': ..., 'memory': ...}, filled on demand
+        return self
+    
+    def sync(self, df):
+        """Return the profile of df, rebuilding it if df is not the profiled frame"""
+        if self.frame() is not df:
+            self.refresh(df)
+        return self
+    
+    def update(self, df, columns):
+        """Recompute the facts of columns whose values changed in df"""
+        self.frame = weakref.ref(df)
+        for col in columns:
+            self.nulls[col] = int(df[col].isnull().sum())
+            self.dtypes[col] = df[col].dtype
+            self.scanned.pop(col, None)
+    
+    def filled(self, df, columns):
+        """Record that the missing values of columns were all filled in df"""
+        self.frame = weakref.ref(df)
+        for col in columns:
+            self.nulls[col] = 0
+            self.dtypes[col] = df[col].dtype
+            self.scanned.pop(col, None)
+    
+    def retyped(self, df, columns):
+        """Record that columns of df changed dtype but kept their values"""
+        self.frame = weakref.ref(df)
+        for col in columns:
+            self.dtypes[col] = df[col].dtype
+            self.scanned.pop(col, None)
+    
+    def filter_rows(self, df, keep):
+        """
+        Return df[keep], the profiled frame without the dropped rows
+        
+        Only the dropped rows of columns that still have missing values are
+        scanned to update the null counts.
+        """
+        drop = ~keep
+        kept = df[keep]
+        if drop.any():
+            with_nulls = [col for col, count in self.nulls.items() if count > 0]
+            if with_nulls:
+                for col, count in df.loc[drop, with_nulls].isnull().sum().items():
+                    self.nulls[col] -= int(count)
+            self.scanned = {}
+        self.frame = weakref.ref(kept)
+        self.rows = len(kept)
+        return kept
+    
+    def rename(self, df, name_mapping):
+        """Carry the facts over to the renamed columns of df"""
+        self.frame = weakref.ref(df)
+        self.nulls = {name_mapping.get(col, col): count for col, count in self.nulls.items()}
+        self.dtypes = {name_mapping.get(col, col): dtype for col, dtype in self.dtypes.items()}
+        self.scanned = {name_mapping.get(col, col): facts for col, facts in self.scanned.items()}
+    
+    def null_counts(self):
+        """Missing values per column, as a Series"""
+        return pd.Series(self.nulls, dtype='int64')
+    
+    def total_nulls(self):
+        return sum(self.nulls.values())
+    
+    def scan(self, col, fact):
+        facts = self.scanned.setdefault(col, {})
+        if fact not in facts:
+            values = self.frame()[col]
+            if fact == 'cardinality':
+                facts[fact] = int(values.nunique())
+            else:
+                facts[fact] = int(values.memory_usage(deep=True, index=False))
+        return facts[fact]
+    
+    def cardinality(self, col):
+        """Number of distinct non-missing values of a column"""
+        return self.scan(col, 'cardinality')
+    
+    def memory(self, col):
+        """Bytes used by a column, including the strings of object columns"""
+        return self.scan(col, 'memory')
+    
+    def to_frame(self):
+        """One row per column: dtype, missing count and percent, cardinality and memory"""
+        columns = list(self.nulls)
+        return pd.DataFrame({
+            'Column': columns,
+            'Dtype': [str(self.dtypes[col]) for col in columns],
+            'Missing_Count': [self.nulls[col] for col in columns],
+            'Missing_Percent': [round(self.nulls[col] / self.rows * 100, 2) if self.rows else 0.0
+                                for col in columns],
+            'Cardinality': [self.cardinality(col) for col in columns],
+            'Memory_KB': [round(self.memory(col) / 1024, 1) for col in columns],
+        })
+
+
 # ============================================================================
 # DATA CLEANING UTILITY
 # ============================================================================
@@ -108,35 +655,79 @@ def generate_dirty_data():
 class DataCleaningUtility:
     """Comprehensive data cleaning utility class"""
     
-    def __init__(self, df):
-        """Initialize with a DataFrame"""
-        self.df = df.copy()
-        self.original_df = df.copy()
-        self.cleaning_log = []
+    def __init__(self, df, lean=False, copy='deep', workers=1, logger=None, profile=None,
+                 original_stats=None):
+        """
+        Initialize with a DataFrame
+        
+        Parameters:
+        - lean: If True, keep only the baseline statistics used by
+          generate_report instead of a second copy of the data
+        - copy: 'deep' (full copy), 'cow' (shallow copy; every step replaces
+          columns instead of writing into them, so the caller's data is
+          never modified) or 'inplace' (no copy: the given DataFrame is
+          consumed. Fills and dtype fixes are written into it, but row drops
+          and renames produce new frames, so afterwards it is neither the
+          input nor the cleaned data and must not be reused; use
+          get_cleaned_data())
+        - workers: Number of processes used for per-column steps
+          (None = one per CPU core)
+        - logger: CleaningLogger controlling level, echo and sinks of the
+          log (default: everything, echoed to stdout)
+        - profile: Per-step profiling: False, 'time', 'memory' (or True),
+          'cprofile', or a StepProfiler (default: the DATA_CLEANING_PROFILE
+          environment variable, off if unset)
+        - original_stats: Baseline rows/columns/missing for the report, when
+          df is not the original input (e.g. a cached result)
+        """
+        if copy == 'deep':
+            self.df = df.copy()
+        elif copy == 'cow':
+            self.df = df.copy(deep=False)
+        elif copy == 'inplace':
+            self.df = df
+        else:
+            raise ValueError(f"Unknown copy mode: {copy}")
+        
+        self.column_profile = ColumnProfile(self.df)
+        self.original_stats = original_stats or {
+            'rows': len(df),
+            'columns': len(df.columns),
+            'missing': self.column_profile.total_nulls()
+        }
+        self.original_df = None if lean else df.copy()
+        self.engine = ParallelColumnEngine(workers)
+        self.state = None
+        self.profiler = make_profiler(profile)
+        self.logger = logger if logger is not None else CleaningLogger()
+        self.cleaning_log = self.logger.entries
         self.log_entry("="*70)
         self.log_entry("DATA CLEANING LOG")
         self.log_entry(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         self.log_entry("="*70)
-        self.log_entry(f"\nOriginal Dataset Shape: {df.shape}")
-        self.log_entry(f"Original Columns: {list(df.columns)}\n")
+        if original_stats is None:
+            self.log_entry(f"\nOriginal Dataset Shape: {df.shape}")
+            self.log_entry(lambda: f"Original Columns: {list(df.columns)}\n", 'detail')
+        else:
+            self.log_entry(f"\nOriginal Dataset Shape: {(original_stats['rows'], original_stats['columns'])}")
     
-    def log_entry(self, message):
-        """Add entry to cleaning log"""
-        self.cleaning_log.append(message)
-        print(message)
+    def log_entry(self, message, level='summary'):
+        """Add entry to cleaning log ('summary', 'detail' or 'debug')"""
+        self.logger.log(message, level)
     
     # ========================================================================
     # 1. DETECT AND HANDLE MISSING VALUES
     # ========================================================================
     
+    @profiled_step
     def detect_missing_values(self):
         """Detect and report missing values"""
         self.log_entry("\n" + "="*70)
         self.log_entry("1. DETECTING MISSING VALUES")
         self.log_entry("="*70)
         
-        missing_count = self.df.isnull().sum()
-        missing_percent = (self.df.isnull().sum() / len(self.df) * 100).round(2)
+        missing_count = self.column_profile.sync(self.df).null_counts()
+        missing_percent = (missing_count / len(self.df) * 100).round(2)
         
         missing_df = pd.DataFrame({
             'Column': missing_count.index,
@@ -148,12 +739,13 @@ class DataCleaningUtility:
         
         if len(missing_df) > 0:
             self.log_entry(f"\nFound missing values in {len(missing_df)} columns:")
-            self.log_entry(missing_df.to_string(index=False))
+            self.logger.log_table(missing_df, 'detail', index=False)
         else:
             self.log_entry("\n✓ No missing values found")
         
         return missing_df
     
+    @profiled_step
     def handle_missing_values(self, strategy='smart'):
         """
         Handle missing values using different strategies
@@ -169,36 +761,49 @@ class DataCleaningUtility:
         self.log_entry(f"Strategy: {strategy}")
         
         rows_before = len(self.df)
+        profile = self.column_profile.sync(self.df)
         
         if strategy == 'drop':
             self.df = self.df.dropna()
+            profile.refresh(self.df)
             self.log_entry(f"Dropped all rows with missing values")
             self.log_entry(f"Rows removed: {rows_before - len(self.df)}")
         
         elif strategy == 'smart':
             # For numerical columns: fill with median if < 30% missing, else drop
             # For categorical columns: fill with mode if < 50% missing, else drop
+            # Drops are collected in one row mask in column order, so each fill
+            # only sees the rows that remain at its position
+            alive = None
+            messages = {}
+            fill_items = []
             
             for col in self.df.columns:
-                missing_pct = (self.df[col].isnull().sum() / len(self.df)) * 100
+                if profile.nulls[col] == 0:
+                    continue
+                nulls = self.df[col].isnull().to_numpy()
+                rows = len(nulls) if alive is None else alive.sum()
+                missing = nulls.sum() if alive is None else (nulls & alive).sum()
+                missing_pct = (missing / rows) * 100
                 
                 if missing_pct > 0:
-                    if self.df[col].dtype in ['float64', 'int64']:
-                        if missing_pct < 30:
-                            median_val = self.df[col].median()
-                            self.df[col].fillna(median_val, inplace=True)
-                            self.log_entry(f"  ✓ Filled '{col}' with median: {median_val:.2f}")
-                        else:
-                            self.df = self.df.dropna(subset=[col])
-                            self.log_entry(f"  ✓ Dropped rows with missing '{col}' (>{30}% missing)")
+                    limit = 30 if is_numeric_column(self.df[col]) else 50
+                    if missing_pct < limit:
+                        fill_items.append((fill_missing_column, col, self.df[col], alive))
                     else:
-                        if missing_pct < 50:
-                            mode_val = self.df[col].mode()[0] if len(self.df[col].mode()) > 0 else "Unknown"
-                            self.df[col].fillna(mode_val, inplace=True)
-                            self.log_entry(f"  ✓ Filled '{col}' with mode: {mode_val}")
-                        else:
-                            self.df = self.df.dropna(subset=[col])
-                            self.log_entry(f"  ✓ Dropped rows with missing '{col}' (>{50}% missing)")
+                        alive = ~nulls if alive is None else alive & ~nulls
+                        messages[col] = [f"  ✓ Dropped rows with missing '{col}' (>{limit}% missing)"]
+            
+            for col, filled, col_messages in self.engine.map(fill_items):
+                self.df[col] = filled
+                messages[col] = col_messages
+            profile.filled(self.df, [col for _, col, _, _ in fill_items])
+            if alive is not None:
+                self.df = profile.filter_rows(self.df, alive)
+            
+            for col in self.df.columns:
+                for message in messages.get(col, []):
+                    self.log_entry(message, 'detail')
         
         else:
             self.log_entry(f"Unknown strategy: {strategy}")
@@ -209,79 +814,91 @@ class DataCleaningUtility:
     # 2. FIX INCORRECT DATA TYPES
     # ========================================================================
     
+    @profiled_step
     def fix_data_types(self):
         """Fix incorrect data types and parse dates"""
         self.log_entry("\n" + "="*70)
         self.log_entry("2. FIXING INCORRECT DATA TYPES")
         self.log_entry("="*70)
         
-        self.log_entry("\nOriginal Data Types:")
-        for col in self.df.columns:
-            self.log_entry(f"  {col}: {self.df[col].dtype}")
+        profile = self.column_profile.sync(self.df)
+        self.log_dtypes("Original Data Types")
         
-        # Fix age column (convert to numeric)
+        # Fix age column and parse dates (each column is independent)
+        items = []
         if 'age' in self.df.columns:
-            self.log_entry("\n--- Fixing 'age' column ---")
-            # Convert non-numeric values
-            self.df['age'] = pd.to_numeric(self.df['age'], errors='coerce')
-            # Fill NaN with median
-            median_age = self.df['age'].median()
-            self.df['age'].fillna(median_age, inplace=True)
-            self.df['age'] = self.df['age'].astype(int)
-            self.log_entry(f"✓ Converted 'age' to integer (filled invalid values with median: {int(median_age)})")
-        
-        # Parse dates
+            items.append((fix_age_column, 'age', self.df['age']))
+        
         date_columns = [col for col in self.df.columns if 'date' in col.lower()]
+        items.extend((parse_date_column, col, self.df[col]) for col in date_columns)
         
-        if date_columns:
-            self.log_entry("\n--- Parsing Date Columns ---")
-            for col in date_columns:
-                try:
-                    self.df[col] = pd.to_datetime(self.df[col], errors='coerce', infer_datetime_format=True)
-                    # Fill missing dates with mode or a default date
-                    if self.df[col].isnull().sum() > 0:
-                        mode_date = self.df[col].mode()[0] if len(self.df[col].mode()) > 0 else pd.Timestamp('2024-01-01')
-                        self.df[col].fillna(mode_date, inplace=True)
-                    self.log_entry(f"✓ Parsed '{col}' as datetime")
-                except Exception as e:
-                    self.log_entry(f"✗ Could not parse '{col}': {str(e)}")
+        for col, fixed, messages in self.engine.map(items):
+            if col == 'age':
+                self.log_entry("\n--- Fixing 'age' column ---", 'detail')
+            elif col == date_columns[0]:
+                self.log_entry("\n--- Parsing Date Columns ---", 'detail')
+            self.df[col] = fixed
+            for message in messages:
+                self.log_entry(message, 'detail')
+        profile.update(self.df, [col for _, col, _ in items])
         
-        self.log_entry("\nUpdated Data Types:")
-        for col in self.df.columns:
-            self.log_entry(f"  {col}: {self.df[col].dtype}")
+        self.log_dtypes("Updated Data Types")
+    
+    def log_dtypes(self, title):
+        """Log the dtype of every column (debug level)"""
+        if not self.logger.enabled('debug'):
+            return
+        self.log_entry(f"\n{title}:", 'debug')
+        for col, dtype in self.column_profile.sync(self.df).dtypes.items():
+            self.log_entry(f"  {col}: {dtype}", 'debug')
     
     # ========================================================================
     # 3. REMOVE DUPLICATES
     # ========================================================================
     
-    def remove_duplicates(self, subset=None, keep='first'):
+    @profiled_step
+    def remove_duplicates(self, subset=None, keep='first', sample_size=20, fuzzy=False):
         """
         Remove duplicate rows
         
         Parameters:
-        - subset: Column(s) to check for duplicates (default: all columns)
-        - keep: 'first', 'last', or False (remove all duplicates)
+        - subset: Column(s) to check for duplicates (default: all columns;
+          with fuzzy, the name, email and phone columns)
+        - keep: 'first', 'last', or False (remove all duplicates); with
+          fuzzy also 'merge' (keep the first row of each cluster, with its
+          missing values filled in from the rest of the cluster)
+        - sample_size: Maximum number of duplicate rows shown in the log
+        - fuzzy: Also remove near-duplicates (different casing, spacing,
+          phone formatting, small typos): True, or a dict of options for
+          find_near_duplicates such as {'threshold': 0.9}
         """
         self.log_entry("\n" + "="*70)
         self.log_entry("3. REMOVING DUPLICATES")
         self.log_entry("="*70)
         
+        if fuzzy:
+            self.remove_near_duplicates(subset, keep, sample_size, fuzzy if isinstance(fuzzy, dict) else {})
+            return
+        if keep == 'merge':
+            raise ValueError("keep='merge' needs fuzzy matching")
+        
         rows_before = len(self.df)
+        profile = self.column_profile.sync(self.df)
         
         if subset:
-            duplicates = self.df.duplicated(subset=subset, keep=False)
+            duplicates, drop, groups = find_duplicates(self.df[subset], keep)
             self.log_entry(f"\nChecking duplicates based on: {subset}")
         else:
-            duplicates = self.df.duplicated(keep=False)
+            duplicates, drop, groups = find_duplicates(self.df, keep)
             self.log_entry("\nChecking duplicates based on all columns")
         
         duplicate_count = duplicates.sum()
         
         if duplicate_count > 0:
-            self.log_entry(f"Found {duplicate_count} duplicate rows:")
-            self.log_entry(self.df[duplicates].to_string())
+            sample_rows = self.df.iloc[np.flatnonzero(duplicates)[:sample_size]]
+            log_duplicates(self.logger, sample_rows, duplicate_count, groups)
             
-            self.df = self.df.drop_duplicates(subset=subset, keep=keep)
+            self.df = profile.filter_rows(self.df, ~drop)
             rows_removed = rows_before - len(self.df)
             self.log_entry(f"\n✓ Removed {rows_removed} duplicate rows (keeping '{keep}')")
         else:
@@ -289,60 +906,326 @@ class DataCleaningUtility:
         
         self.log_entry(f"Rows after removing duplicates: {len(self.df)}")
     
+    def remove_near_duplicates(self, subset, keep, sample_size, options):
+        """Cluster near-duplicate rows (see find_near_duplicates) and keep or merge one row per cluster"""
+        if keep not in ('first', 'last', 'merge', False):
+            raise ValueError(f"Unknown keep rule: {keep}")
+        if subset:
+            columns = [subset] if isinstance(subset, str) else list(subset)
+        else:
+            columns = match_columns(self.df)
+        self.log_entry(f"\nChecking near-duplicates based on: {columns}")
+        
+        rows_before = len(self.df)
+        clusters, candidates = find_near_duplicates(self.df[columns], **options)
+        self.log_entry(f"Compared {candidates} candidate pairs "
+                       f"(of {rows_before * (rows_before - 1) // 2} possible)", 'detail')
+        
+        positions = np.arange(rows_before)
+        sizes = np.bincount(clusters, minlength=rows_before)
+        duplicates = sizes[clusters] > 1
+        duplicate_count = int(duplicates.sum())
+        
+        if duplicate_count == 0:
+            self.log_entry("\n✓ No near-duplicate rows found")
+            self.log_entry(f"Rows after removing duplicates: {len(self.df)}")
+            return
+        
+        # Show the sample cluster by cluster
+        sample = np.flatnonzero(duplicates)
+        sample = sample[np.argsort(clusters[sample], kind='stable')][:sample_size]
+        log_duplicates(self.logger, self.df.iloc[sample], duplicate_count, int((sizes > 1).sum()))
+        
+        if keep == 'last':
+            last = np.zeros(rows_before, dtype=np.int64)
+            np.maximum.at(last, clusters, positions)
+            drop = duplicates & (last[clusters] != positions)
+        elif keep is False:
+            drop = duplicates
+        else:
+            drop = clusters != positions
+        
+        merged = merge_clusters(self.df, clusters, duplicates) if keep == 'merge' else None
+        profile = self.column_profile.sync(self.df)
+        self.df = profile.filter_rows(self.df, ~drop)
+        
+        if merged is not None:
+            # Rows of self.df holding the first row of each cluster
+            targets = np.searchsorted(np.flatnonzero(~drop), merged.index.to_numpy())
+            filled = []
+            for col in self.df.columns:
+                values = self.df[col]
+                fill = values.iloc[targets].isnull().to_numpy() & merged[col].notnull().to_numpy()
+                if fill.any():
+                    values = values.copy()
+                    values.iloc[targets[fill]] = merged[col].to_numpy()[fill]
+                    self.df[col] = values
+                    filled.append(col)
+            profile.update(self.df, filled)
+            self.log_entry(f"✓ Merged {len(merged)} clusters, filling missing values in {len(filled)} columns", 'detail')
+        
+        rows_removed = rows_before - len(self.df)
+        rule = "merging each cluster" if keep == 'merge' else f"keeping '{keep}'"
+        self.log_entry(f"\n✓ Removed {rows_removed} near-duplicate rows ({rule})")
+        self.log_entry(f"Rows after removing duplicates: {len(self.df)}")
+    
     # ========================================================================
     # 4. STANDARDIZE COLUMN NAMES
     # ========================================================================
     
+    @staticmethod
+    def clean_column_name(col):
+        """Return the standardized form of a single column name"""
+        # Remove leading/trailing spaces, convert to lowercase, replace spaces with underscores
+        new_name = col.strip().lower().replace(' ', '_').replace('-', '_')
+        # Remove special characters
+        return ''.join(c for c in new_name if c.isalnum() or c == '_')
+    
+    @profiled_step
     def standardize_column_names(self):
         """Standardize column names (lowercase, underscores, no spaces)"""
         self.log_entry("\n" + "="*70)
         self.log_entry("4. STANDARDIZING COLUMN NAMES")
         self.log_entry("="*70)
         
-        self.log_entry("\nOriginal Column Names:")
-        self.log_entry(f"  {list(self.df.columns)}")
+        self.log_entry("\nOriginal Column Names:", 'detail')
+        self.log_entry(lambda: f"  {list(self.df.columns)}", 'detail')
         
         # Create mapping of old to new names
-        name_mapping = {}
-        for col in self.df.columns:
-            # Remove leading/trailing spaces, convert to lowercase, replace spaces with underscores
-            new_name = col.strip().lower().replace(' ', '_').replace('-', '_')
-            # Remove special characters
-            new_name = ''.join(c for c in new_name if c.isalnum() or c == '_')
-            name_mapping[col] = new_name
+        name_mapping = {col: self.clean_column_name(col) for col in self.df.columns}
         
-        self.df.rename(columns=name_mapping, inplace=True)
+        profile = self.column_profile.sync(self.df)
+        self.df = self.df.rename(columns=name_mapping, copy=False)
+        profile.rename(self.df, name_mapping)
         
-        self.log_entry("\nStandardized Column Names:")
-        self.log_entry(f"  {list(self.df.columns)}")
+        self.log_entry("\nStandardized Column Names:", 'detail')
+        self.log_entry(lambda: f"  {list(self.df.columns)}", 'detail')
         
-        if name_mapping:
-            self.log_entry("\nChanges made:")
+        if name_mapping and self.logger.enabled('detail'):
+            self.log_entry("\nChanges made:", 'detail')
             for old, new in name_mapping.items():
                 if old != new:
-                    self.log_entry(f"  '{old}' → '{new}'")
+                    self.log_entry(f"  '{old}' → '{new}'", 'detail')
     
     # ========================================================================
     # 5. STANDARDIZE TEXT DATA
     # ========================================================================
     
-    def standardize_text_data(self):
-        """Standardize text data (consistent capitalization, trim whitespace)"""
+    @profiled_step
+    def standardize_text_data(self, output='auto'):
+        """
+        Standardize text data (consistent capitalization, trim whitespace)
+        
+        Parameters:
+        - output: dtype of the standardized columns: 'object', 'category'
+          (best for low-cardinality columns), 'arrow' (pyarrow-backed
+          strings) or 'auto' (default: 'arrow' for Arrow-backed columns,
+          'object' otherwise)
+        """
+        if output not in TEXT_OUTPUTS:
+            raise ValueError(f"Unknown text output: {output}")
+        
         self.log_entry("\n" + "="*70)
         self.log_entry("5. STANDARDIZING TEXT DATA")
         self.log_entry("="*70)
         
-        text_columns = self.df.select_dtypes(include=['object']).columns
+        text_columns = [col for col in self.df.columns if is_text_column(self.df[col])]
+        items = [(standardize_text_column, col, self.df[col], output) for col in text_columns]
         
-        for col in text_columns:
-            # Skip email columns (preserve case)
-            if 'email' in col.lower():
-                self.df[col] = self.df[col].str.strip().str.lower()
-                self.log_entry(f"✓ Standardized '{col}' (lowercase, trimmed)")
-            else:
-                # Title case for names, trim whitespace
-                self.df[col] = self.df[col].str.strip().str.title()
-                self.log_entry(f"✓ Standardized '{col}' (title case, trimmed)")
+        profile = self.column_profile.sync(self.df)
+        for col, standardized, messages in self.engine.map(items):
+            self.df[col] = standardized
+            for message in messages:
+                self.log_entry(message, 'detail')
+        profile.update(self.df, text_columns)
+    
+    # ========================================================================
+    # 6. OPTIMIZE MEMORY
+    # ========================================================================
+    
+    @profiled_step
+    def optimize_memory(self, downcast_floats=False, category_threshold=0.5, strings='object'):
+        """
+        Store every column in the smallest dtype that keeps its values
+        
+        Parameters:
+        - downcast_floats: Also store floats as float32 (off by default:
+          float32 keeps only about 7 significant digits)
+        - category_threshold: Text columns with at most this many distinct
+          values per non-missing value become 'category' (None: never)
+        - strings: dtype of the other text columns: 'object' (unchanged),
+          'string' (nullable strings) or 'arrow' (pyarrow-backed strings)
+        """
+        if strings not in STRING_OUTPUTS:
+            raise ValueError(f"Unknown string output: {strings}")
+        
+        self.log_entry("\n" + "="*70)
+        self.log_entry("6. OPTIMIZING MEMORY")
+        self.log_entry("="*70)
+        
+        profile = self.column_profile.sync(self.df)
+        dtypes = dict(profile.dtypes)
+        before = {col: profile.memory(col) for col in self.df.columns}
+        
+        items = []
+        for col in self.df.columns:
+            values = self.df[col]
+            category = False
+            if category_threshold is not None and is_text_column(values):
+                present = len(values) - profile.nulls[col]
+                category = present > 0 and profile.cardinality(col) <= category_threshold * present
+            items.append((optimize_column, col, values, downcast_floats, category, strings))
+        
+        changed = []
+        for col, optimized, _ in self.engine.map(items):
+            if optimized.dtype != dtypes[col]:
+                self.df[col] = optimized
+                changed.append(col)
+        profile.retyped(self.df, changed)
+        
+        after = {col: profile.memory(col) for col in self.df.columns}
+        table = pd.DataFrame({
+            'Column': list(before),
+            'Dtype': [f"{dtypes[col]} -> {profile.dtypes[col]}" if col in changed else str(dtypes[col])
+                      for col in before],
+            'Before_KB': [round(before[col] / 1024, 1) for col in before],
+            'After_KB': [round(after[col] / 1024, 1) for col in before],
+        })
+        self.log_entry(f"\nMemory per column ({len(changed)} columns converted):", 'detail')
+        self.logger.log_table(table, 'detail', index=False)
+        
+        total_before, total_after = sum(before.values()), sum(after.values())
+        saved = (1 - total_after / total_before) * 100 if total_before else 0.0
+        self.log_entry(f"\n✓ Memory: {total_before / 1024:,.1f} KB -> {total_after / 1024:,.1f} KB "
+                       f"({saved:.1f}% smaller)")
+    
+    # ========================================================================
+    # FIT / TRANSFORM
+    # ========================================================================
+    
+    def fit(self, strategy='smart', state=None, statistics=None):
+        """
+        Learn the cleaning statistics of the current data
+        
+        Parameters:
+        - strategy: Missing value strategy ('smart' or 'drop')
+        - state: CleaningState fitted on earlier batches, updated with this
+          data instead of starting from scratch
+        - statistics: Empty statistics object for a new state (default:
+          SketchStatistics, whose saved state stays a fixed size;
+          CleaningStatistics for exact medians and modes)
+        
+        Returns the CleaningState (also kept as self.state); persist it
+        with state.save() and apply it to new batches with transform().
+        """
+        self.log_entry("\n" + "="*70)
+        self.log_entry("FITTING CLEANING STATE")
+        self.log_entry("="*70)
+        
+        if state is None:
+            state = CleaningState(strategy, statistics)
+        state.partial_fit(self.df)
+        self.state = state
+        
+        self.log_entry(f"\nFitted on {state.stats.total_rows} rows in total ({len(self.df)} new)")
+        self.log_entry(f"Strategy: {state.strategy}")
+        for message, level in state.messages:
+            self.log_entry(message, level)
+        return state
+    
+    def transform(self, state=None, subset=None, keep='first'):
+        """
+        Clean the data in one pass with fitted statistics
+        
+        Applies handle_missing_values, fix_data_types, remove_duplicates
+        (within this data), standardize_column_names and
+        standardize_text_data using the values learned by fit, so a new
+        batch is cleaned consistently with all the data the state has seen.
+        
+        Parameters:
+        - state: CleaningState to apply (default: the one learned by fit)
+        - subset, keep: Duplicate check, as in remove_duplicates
+        """
+        state = state if state is not None else self.state
+        if state is None:
+            raise ValueError("No cleaning state: call fit() or pass a saved CleaningState")
+        
+        self.log_entry("\n" + "="*70)
+        self.log_entry("APPLYING FITTED CLEANING STATE")
+        self.log_entry("="*70)
+        self.log_entry(f"\nState fitted on {state.stats.total_rows} rows (strategy: {state.strategy})")
+        rows_before = len(self.df)
+        
+        df = state.handle_missing_values(self.df)
+        for col in df.columns[df.isnull().any()]:
+            self.log_entry(f"  ! '{col}' has missing values but none were seen when fitting; left as is", 'detail')
+        self.log_entry(f"Rows after handling missing values: {len(df)}")
+        
+        df = state.fix_data_types(df.copy(deep=False))
+        self.log_entry("✓ Converted 'age' and date columns with the fitted fallbacks", 'detail')
+        
+        _, drop, _ = find_duplicates(df[subset] if subset else df, keep)
+        df = df[~drop]
+        self.log_entry(f"✓ Removed {int(drop.sum())} duplicate rows (keeping '{keep}')")
+        
+        df = df.rename(columns=state.column_name, copy=False)
+        items = [(standardize_text_column, col, df[col]) for col in df.columns if is_text_column(df[col])]
+        for col, standardized, messages in self.engine.map(items):
+            df[col] = standardized
+            for message in messages:
+                self.log_entry(message, 'detail')
+        
+        self.df = df
+        self.log_entry(f"\nRows: {rows_before} -> {len(df)}")
+        return df
+    
+    # ========================================================================
+    # CACHED PIPELINE
+    # ========================================================================
+    
+    def run_steps(self, steps, cache=None, input_key=None):
+        """
+        Run a list of (step, kwargs) pairs, e.g. [('fix_data_types', {})]
+        
+        With a ResultCache, the result of every step is stored under a key
+        chained from the input and the steps before it. The deepest step
+        already in the cache is loaded (with its log) and only the steps
+        after it run, so a full hit runs no step at all.
+        
+        Parameters:
+        - steps: Method names of this class with their keyword arguments
+        - cache: Optional ResultCache
+        - input_key: Cache key of the input (default: a hash of self.df)
+        """
+        start = 0
+        records = []
+        if cache is not None:
+            keys = pipeline_keys(input_key or ResultCache.frame_key(self.df), steps, self.logger)
+            for i in reversed(range(len(steps))):
+                hit = cache.get(keys[i])
+                if hit is not None:
+                    self.df, records, _ = hit
+                    self.log_entry(f"✓ Cached result of the first {i + 1} of {len(steps)} steps")
+                    self.replay_log(records)
+                    start = i + 1
+                    break
+        
+        for i in range(start, len(steps)):
+            step, kwargs = steps[i]
+            self.logger.capture = []
+            try:
+                getattr(self, step)(**kwargs)
+                records = records + self.logger.capture
+            finally:
+                self.logger.capture = None
+            if cache is not None:
+                cache.put(keys[i], self.df, records, self.original_stats)
+        return self.df
+    
+    def replay_log(self, records):
+        """Log (message, level) records captured in an earlier run"""
+        for message, level in records:
+            self.log_entry(message, level)
     
     # ========================================================================
     # GENERATE CLEANING REPORT
@@ -355,74 +1238,2548 @@ class DataCleaningUtility:
         self.log_entry("="*70)
         
         self.log_entry(f"\nOriginal Dataset:")
-        self.log_entry(f"  Rows: {len(self.original_df)}")
-        self.log_entry(f"  Columns: {len(self.original_df.columns)}")
-        self.log_entry(f"  Missing Values: {self.original_df.isnull().sum().sum()}")
+        self.log_entry(f"  Rows: {self.original_stats['rows']}")
+        self.log_entry(f"  Columns: {self.original_stats['columns']}")
+        self.log_entry(f"  Missing Values: {self.original_stats['missing']}")
         
         self.log_entry(f"\nCleaned Dataset:")
         self.log_entry(f"  Rows: {len(self.df)}")
         self.log_entry(f"  Columns: {len(self.df.columns)}")
-        self.log_entry(f"  Missing Values: {self.df.isnull().sum().sum()}")
+        self.log_entry(f"  Missing Values: {self.column_profile.sync(self.df).total_nulls()}")
+        
+        rows_removed = self.original_stats['rows'] - len(self.df)
+        if self.original_stats['rows'] > 0:
+            self.log_entry(f"\nRows Removed: {rows_removed} ({(rows_removed/self.original_stats['rows']*100):.2f}%)")
         
-        rows_removed = len(self.original_df) - len(self.df)
-        self.log_entry(f"\nRows Removed: {rows_removed} ({(rows_removed/len(self.original_df)*100):.2f}%)")
+        if self.profiler is not None and self.profiler.records:
+            self.log_profile()
         
         self.log_entry(f"\nCleaned at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         self.log_entry("="*70)
     
+    def log_profile(self, top_columns=10):
+        """Log the step timing and memory table and the slowest columns"""
+        steps = self.profiler.to_frame()
+        table = pd.DataFrame({
+            'Step': steps['step'],
+            'Wall_s': steps['wall_seconds'].round(3),
+            'CPU_s': steps['cpu_seconds'].round(3),
+            'Peak_MB': (steps['peak_bytes'] / 1024**2).round(2),
+            'Alloc_MB': (steps['allocated_bytes'] / 1024**2).round(2),
+            'Rows': steps['rows_in'].astype(str) + ' -> ' + steps['rows_out'].astype(str),
+            'Columns': steps['columns_in'].astype(str) + ' -> ' + steps['columns_out'].astype(str),
+        })
+        self.log_entry(f"\nStep Profile (total {steps['wall_seconds'].sum():.3f}s):")
+        self.logger.log_table(table, 'detail', index=False)
+        
+        columns = self.profiler.columns_frame()
+        if len(columns) > 0:
+            slowest = columns.sort_values('seconds', ascending=False).head(top_columns)
+            self.log_entry("\nSlowest Columns:", 'detail')
+            self.logger.log_table(slowest.round({'seconds': 4}), 'detail', index=False)
+    
+    def get_profile(self):
+        """Return the per-step profile records (empty if profiling is off)"""
+        return self.profiler.records if self.profiler is not None else []
+    
+    def save_profile(self, filename='cleaning_profile.json'):
+        """Export the per-step profile as JSON"""
+        if self.profiler is None:
+            raise ValueError("Profiling is not enabled for this cleaner")
+        self.profiler.save(filename)
+        print(f"\n✓ Cleaning profile saved to '{filename}'")
+    
+    def get_column_profile(self):
+        """Return the dtype, missing values, cardinality and memory of every column"""
+        return self.column_profile.sync(self.df).to_frame()
+    
+    def lazy(self):
+        """Return a LazyCleaningPipeline that queues steps and runs them as one plan"""
+        return LazyCleaningPipeline(self)
+    
     def get_cleaned_data(self):
         """Return the cleaned DataFrame"""
         return self.df
     
+    @classmethod
+    def from_file(cls, path, columns=None, row_groups=None, dtype_backend='pyarrow', **kwargs):
+        """
+        Create a cleaner from a CSV, Parquet, Feather or Arrow IPC file
+        
+        columns, row_groups and dtype_backend are passed to read_data; the
+        other keyword arguments to the constructor. The data is read with
+        Arrow-backed dtypes by default, so pass copy='cow' to avoid copying it.
+        """
+        return cls(read_data(path, columns, row_groups, dtype_backend), **kwargs)
+    
+    def save_cleaned_data(self, path, **kwargs):
+        """Save the cleaned data; the format (CSV, Parquet, Feather, Arrow) follows the extension"""
+        write_data(self.df, path, **kwargs)
+        print(f"\n✓ Cleaned data saved to '{path}'")
+    
     def save_cleaning_log(self, filename='cleaning_log.txt'):
-        """Save cleaning log to file"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(self.cleaning_log))
+        """Save cleaning log to file, writing it entry by entry"""
+        write_log_entries(self.cleaning_log, filename)
+        self.logger.close()
         print(f"\n✓ Cleaning log saved to '{filename}'")
 
 
+def write_log_entries(entries, filename):
+    """Stream log entries to a text file, one per line"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        for i, entry in enumerate(entries):
+            if i > 0:
+                f.write('\n')
+            f.write(entry)
+
+
 # ============================================================================
-# MAIN EXECUTION
+# DATE PARSING
 # ============================================================================
 
-def main():
-    """Main function to demonstrate data cleaning"""
-    print("\n" + "="*70)
-    print(" "*15 + "DATA CLEANING UTILITY")
-    print(" "*10 + "Syntecxhub Data Science Internship")
-    print(" "*20 + "Week 1 - Project 3")
-    print("="*70 + "\n")
+class DateParser:
+    """
+    Cached multi-format date parser
     
-    # Generate dirty data
-    dirty_df = generate_dirty_data()
+    Only the distinct strings of a column are parsed. A sample of them shows
+    which known formats the column uses; the distinct values are then parsed
+    group by group with each explicit format (most common first), and only
+    what is left goes through the slow element-wise dateutil parser.
+    Results are cached per string, so values repeated in other columns or
+    later runs are not parsed again.
     
-    print("\n" + "="*70)
-    print("DIRTY DATA PREVIEW")
-    print("="*70)
-    print(dirty_df.head(10))
-    print(f"\nShape: {dirty_df.shape}")
-    print(f"Missing values: {dirty_df.isnull().sum().sum()}")
+    The default formats never match the same string with different results
+    (month/day order is always US style), so a cached value does not depend
+    on the column it was first seen in. Keep that property when passing
+    custom formats.
+    """
     
-    # Initialize cleaning utility
-    cleaner = DataCleaningUtility(dirty_df)
+    FORMATS = [
+        '%Y-%m-%d', '%Y/%m/%d', '%m/%d/%Y', '%m-%d-%Y', '%d.%m.%Y',
+        '%B %d, %Y', '%b %d, %Y', '%d %B %Y', '%d %b %Y',
+        '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%m/%d/%Y %H:%M', '%Y%m%d'
+    ]
     
-    # Perform cleaning steps
-    cleaner.detect_missing_values()
-    cleaner.handle_missing_values(strategy='smart')
-    cleaner.fix_data_types()
-    cleaner.remove_duplicates(subset=['Customer ID'])
-    cleaner.standardize_column_names()
-    cleaner.standardize_text_data()
+    def __init__(self, formats=None, sample_size=1000, max_cache_size=1000000):
+        self.formats = list(formats or self.FORMATS)
+        self.sample_size = sample_size
+        self.max_cache_size = max_cache_size
+        self.cache = {}
+        self.added = None  # While a dict, also collects every newly cached string
     
-    # Generate report
-    cleaner.generate_report()
+    def detect_formats(self, strings):
+        """Return the formats found in a sample of distinct strings, most common first"""
+        sample = strings
+        if len(sample) > self.sample_size:
+            sample = sample.sample(self.sample_size, random_state=0)
+        
+        hits = {}
+        for fmt in self.formats:
+            count = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+            if count > 0:
+                hits[fmt] = count
+        return sorted(hits, key=lambda fmt: -hits[fmt])
     
-    # Get cleaned data
-    cleaned_df = cleaner.get_cleaned_data()
+    def parse_strings(self, strings, formats):
+        """Parse distinct strings format by format; return a dict of string -> Timestamp/NaT"""
+        result = {}
+        remaining = strings.str.strip()
+        
+        for fmt in formats + [fmt for fmt in self.formats if fmt not in formats]:
+            if len(remaining) == 0:
+                break
+            parsed = pd.to_datetime(remaining, format=fmt, errors='coerce')
+            hit = parsed.notna().to_numpy()
+            if hit.any():
+                result.update(zip(strings[remaining.index[hit]], parsed[hit]))
+                remaining = remaining[~hit]
+        
+        if len(remaining) > 0:
+            parsed = pd.to_datetime(remaining, format='mixed', errors='coerce')
+            result.update(zip(strings[remaining.index], parsed))
+        return result
     
-    print("\n" + "="*70)
-    print("CLEANED DATA PREVIEW")
-    print("="*70)
+    def parse_column(self, values):
+        """
+        Parse a Series into datetime64 values (NaT where unparseable)
+        
+        Returns the parsed Series and the formats detected in it.
+        """
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values, []
+        
+        codes, uniques = pd.factorize(values)
+        if len(uniques) == 0:
+            return pd.Series(pd.NaT, index=values.index, name=values.name, dtype='datetime64[ns]'), []
+        
+        keys = pd.Series([u if isinstance(u, str) else str(u) for u in uniques], dtype=object)
+        formats = self.detect_formats(keys)
+        
+        cached = np.fromiter((key in self.cache for key in keys), dtype=bool, count=len(keys))
+        unknown = keys[~cached].drop_duplicates()
+        parsed = {}
+        if len(unknown) > 0:
+            parsed = self.parse_strings(unknown.reset_index(drop=True), formats)
+        
+        # Look everything up before caching: a full cache is cleared by add_to_cache
+        parsed_uniques = pd.DatetimeIndex([parsed[key] if key in parsed else self.cache[key] for key in keys])
+        self.add_to_cache(parsed)
+        parsed = parsed_uniques.take(codes, allow_fill=True, fill_value=pd.NaT)
+        return pd.Series(parsed, index=values.index, name=values.name), formats
+    
+    def add_to_cache(self, parsed):
+        """Cache a dict of string -> Timestamp/NaT, starting over when the cache is full"""
+        if len(self.cache) + len(parsed) > self.max_cache_size:
+            self.cache.clear()
+        self.cache.update(parsed)
+        if self.added is not None:
+            self.added.update(parsed)
+    
+    def parse(self, values):
+        """Parse a Series into datetime64 values (NaT where unparseable)"""
+        return self.parse_column(values)[0]
+    
+    def save_cache(self, filename='date_cache.pkl'):
+        """Save the parsed-string cache so later runs can reuse it"""
+        pd.to_pickle(self.cache, filename)
+    
+    def load_cache(self, filename='date_cache.pkl'):
+        """Load a cache written by save_cache"""
+        self.cache.update(pd.read_pickle(filename))
+
+
+# Shared parser, so the cache is reused across columns and cleaning runs
+DATE_PARSER = DateParser()
+
+
+# ============================================================================
+# DEDUPLICATION
+# ============================================================================
+
+def hash_rows(keys):
+    """64-bit hash of every row of a DataFrame (the index is ignored)"""
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def find_duplicates(keys, keep='first'):
+    """
+    Hash every row once and find its duplicates
+    
+    Returns (duplicates, drop, groups): a mask of all rows that have a
+    duplicate, a mask of the rows to remove for the given keep rule, and
+    the number of duplicate groups. Rows are compared by their 64-bit hash,
+    so the chance of two different rows colliding is negligible (about
+    n^2 / 2^65).
+    """
+    codes, uniques = pd.factorize(hash_rows(keys))
+    counts = np.bincount(codes, minlength=len(uniques))
+    duplicates = counts[codes] > 1
+    drop = pd.Series(codes).duplicated(keep=keep).to_numpy()
+    return duplicates, drop, int((counts > 1).sum())
+
+
+def log_duplicates(logger, sample_rows, duplicate_count, groups):
+    """Log the duplicate counts plus a bounded sample of the duplicate rows"""
+    logger.log(f"Found {duplicate_count} duplicate rows in {groups} groups:")
+    if len(sample_rows) > 0:
+        logger.log_table(sample_rows, 'detail')
+    if duplicate_count > len(sample_rows):
+        logger.log(f"... {duplicate_count - len(sample_rows)} more duplicate rows not shown", 'detail')
+
+
+class HashDeduplicator:
+    """
+    Out-of-core duplicate detection across chunks and files
+    
+    Rows are added as chunks of 64-bit hashes and numbered globally in the
+    order they arrive. Hashes are routed to partitions by hash % partitions
+    and buffered in memory; once more than memory_limit hashes are buffered,
+    every partition is appended to its own file on disk. resolve() then
+    loads one partition at a time, so peak memory is about one partition
+    plus a one-byte flag per row.
+    """
+    
+    RECORD = np.dtype([('hash', '<u8'), ('row', '<i8')])
+    
+    def __init__(self, keep='first', partitions=16, memory_limit=10000000, spill_dir=None):
+        if partitions < 1:
+            raise ValueError("partitions must be at least 1")
+        self.keep = keep
+        self.partitions = partitions
+        self.memory_limit = memory_limit
+        self.spill_dir = spill_dir
+        self.owns_spill_dir = False
+        self.buffers = [[] for _ in range(partitions)]
+        self.buffered = 0
+        self.files = {}
+        self.total_rows = 0
+        self.duplicate_count = 0
+        self.groups = 0
+    
+    def add(self, hashes):
+        """Add the row hashes of one chunk"""
+        records = np.empty(len(hashes), dtype=self.RECORD)
+        records['hash'] = hashes
+        records['row'] = np.arange(self.total_rows, self.total_rows + len(hashes))
+        self.total_rows += len(hashes)
+        
+        # A stable sort keeps each partition's records in row order
+        partition = records['hash'] % np.uint64(self.partitions)
+        order = np.argsort(partition, kind='stable')
+        bounds = np.searchsorted(partition[order], np.arange(self.partitions + 1, dtype=np.uint64))
+        for p in range(self.partitions):
+            if bounds[p] < bounds[p + 1]:
+                self.buffers[p].append(records[order[bounds[p]:bounds[p + 1]]])
+        self.buffered += len(records)
+        
+        if self.buffered > self.memory_limit:
+            self.spill()
+    
+    def spill(self):
+        """Append every buffered partition to its file on disk"""
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix='dedup_')
+            self.owns_spill_dir = True
+        os.makedirs(self.spill_dir, exist_ok=True)
+        for p, buffer in enumerate(self.buffers):
+            if buffer:
+                path = self.files.setdefault(p, os.path.join(self.spill_dir, f"partition_{p}.bin"))
+                with open(path, 'ab') as f:
+                    for records in buffer:
+                        records.tofile(f)
+        self.buffers = [[] for _ in range(self.partitions)]
+        self.buffered = 0
+    
+    def load_partition(self, p):
+        """All records of one partition, in row order"""
+        parts = []
+        if p in self.files:
+            parts.append(np.fromfile(self.files[p], dtype=self.RECORD))
+        parts.extend(self.buffers[p])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=self.RECORD)
+    
+    def resolve(self):
+        """Return a mask over all added rows marking the rows to remove"""
+        drop = np.zeros(self.total_rows, dtype=bool)
+        self.duplicate_count = 0
+        self.groups = 0
+        
+        for p in range(self.partitions):
+            records = self.load_partition(p)
+            if len(records) == 0:
+                continue
+            hashes = pd.Series(records['hash'])
+            duplicates = hashes.duplicated(keep=False).to_numpy()
+            self.duplicate_count += int(duplicates.sum())
+            self.groups += int(hashes[duplicates].nunique())
+            drop[records['row'][hashes.duplicated(keep=self.keep).to_numpy()]] = True
+        return drop
+    
+    def close(self):
+        """Delete the spill files"""
+        for path in self.files.values():
+            if os.path.exists(path):
+                os.remove(path)
+        if self.owns_spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+        self.files = {}
+        self.buffers = [[] for _ in range(self.partitions)]
+        self.buffered = 0
+
+
+# ============================================================================
+# NEAR-DUPLICATE DETECTION
+# ============================================================================
+
+# Without an explicit subset, near-duplicates are matched on the text
+# columns whose names contain one of these words
+MATCH_KEYWORDS = ('name', 'email', 'phone')
+
+NEAR_DUPLICATE_METHODS = ('minhash', 'sorted_neighbourhood')
+
+
+def match_columns(df):
+    """Default columns for near-duplicate matching: name, email and phone text columns"""
+    text = [col for col in df.columns if is_text_column(df[col])]
+    keyed = [col for col in text if any(word in str(col).lower() for word in MATCH_KEYWORDS)]
+    return keyed or text
+
+
+def normalize_match_values(col, values):
+    """
+    Codes of the normalized values of a column, for matching
+    
+    Text is lowercased with whitespace collapsed; emails lose all
+    whitespace and phone numbers everything but their digits. Only the
+    distinct values are normalized. Returns (codes, uniques): the code of
+    every row (-1 for missing) into the sorted normalized values.
+    """
+    codes, uniques = pd.factorize(values)
+    text = pd.Series(np.asarray(uniques, dtype=object)).astype(str)
+    name = str(col).lower()
+    if 'phone' in name:
+        text = text.str.replace(r'\D', '', regex=True)
+    elif 'email' in name:
+        text = text.str.replace(r'\s', '', regex=True).str.lower()
+    else:
+        text = text.str.replace(r'\s+', ' ', regex=True).str.strip().str.lower()
+    
+    normalized, normalized_uniques = pd.factorize(text.to_numpy(), sort=True)
+    empty = np.flatnonzero(normalized_uniques == '')
+    if len(empty) > 0:
+        normalized = np.where(normalized == empty[0], -1, normalized - (normalized > empty[0]))
+        normalized_uniques = np.delete(normalized_uniques, empty[0])
+    row_codes = np.where(codes >= 0, normalized[codes] if len(normalized) else codes, -1)
+    return row_codes, normalized_uniques
+
+
+def mix64(x):
+    """splitmix64 finalizer: scramble uint64 values"""
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def minhash_signatures(strings, num_perm=32, seed=0, batch_size=100000):
+    """
+    MinHash signatures of the character 3-grams of each string
+    
+    Every string is padded with a space on both sides, so even one
+    character yields a 3-gram. The fraction of agreeing positions of two
+    signatures estimates the Jaccard similarity of their 3-gram sets. Only
+    the top 32 bits of each 64-bit minimum are kept: that halves the
+    signatures, and since the top bits of a minimum are the minimum of the
+    top bits, the elementwise minimum of the signatures of several strings
+    (hashed with different seeds) is still the signature of their union.
+    """
+    # Hash functions a * mix64(gram) + b (mod 2^64) with odd a; their top bits are well mixed
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    offsets = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+    signatures = np.empty((len(strings), num_perm), dtype=np.uint32)
+    
+    for start in range(0, len(strings), batch_size):
+        padded = [f" {s} " for s in strings[start:start + batch_size]]
+        lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+        chars = np.frombuffer(''.join(padded).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        
+        # Every 3-gram packed into one integer (code points fit in 21 bits)
+        counts = lengths - 2
+        firsts = np.cumsum(counts) - counts
+        positions = np.repeat(np.cumsum(lengths) - lengths - firsts, counts) + np.arange(counts.sum())
+        grams = (chars[positions] << np.uint64(42)) | (chars[positions + 1] << np.uint64(21)) | chars[positions + 2]
+        
+        with np.errstate(over='ignore'):
+            hashed = mix64(grams)
+            for i in range(num_perm):
+                minimums = np.minimum.reduceat(hashed * multipliers[i] + offsets[i], firsts)
+                signatures[start:start + len(padded), i] = minimums >> np.uint64(32)
+    return signatures
+
+
+def block_pairs(rows, blocks, rank, window):
+    """
+    Candidate pairs of rows that share a block
+    
+    Rows are sorted by block, then by rank, and each row is paired with
+    its next `window` neighbours in its block: every pair of a small block,
+    a sorted neighbourhood of a large one. Returns (first, second) row
+    arrays with first < second.
+    """
+    _, inverse, counts = np.unique(blocks, return_inverse=True, return_counts=True)
+    shared = counts[inverse] > 1
+    rows, blocks = rows[shared], blocks[shared]
+    order = np.lexsort((rank[rows], blocks))
+    rows, blocks = rows[order], blocks[order]
+    
+    first, second = [], []
+    for k in range(1, window + 1):
+        same = blocks[:-k] == blocks[k:]
+        if not same.any():
+            break
+        first.append(rows[:-k][same])
+        second.append(rows[k:][same])
+    if not first:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    a, b = np.concatenate(first), np.concatenate(second)
+    return np.minimum(a, b), np.maximum(a, b)
+
+
+class UnionFind:
+    """
+    Disjoint sets over rows 0..n-1, merged a whole array of pairs at a time
+    
+    Every set's root is its smallest row, and parent[x] <= x always holds.
+    union() hooks the larger root of each pair under the smaller one and
+    compresses paths by pointer jumping until all pairs share a root.
+    """
+    
+    def __init__(self, n):
+        self.parent = np.arange(n)
+    
+    def compress(self):
+        while True:
+            grandparent = self.parent[self.parent]
+            if np.array_equal(grandparent, self.parent):
+                return
+            self.parent = grandparent
+    
+    def union(self, a, b):
+        while len(a) > 0:
+            self.compress()
+            root_a, root_b = self.parent[a], self.parent[b]
+            differ = root_a != root_b
+            a, b, root_a, root_b = a[differ], b[differ], root_a[differ], root_b[differ]
+            np.minimum.at(self.parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+    
+    def roots(self):
+        """Root (smallest row) of every row's set"""
+        self.compress()
+        return self.parent
+
+
+def find_near_duplicates(keys, threshold=0.8, column_thresholds=None, method='minhash',
+                         num_perm=32, bands=8, window=10, seed=0):
+    """
+    Cluster rows whose key columns are similar but not necessarily equal
+    
+    Each key column is normalized (see normalize_match_values) and its
+    distinct values get MinHash signatures of their 3-grams. Candidate
+    pairs come from blocking, never from comparing all pairs:
+    - 'minhash': locality-sensitive hashing on the MinHash of each whole
+      record; rows whose signatures agree on every position of one of
+      `bands` bands share a block.
+    - 'sorted_neighbourhood': one pass per column with the rows sorted by
+      that column.
+    Within a block each row is compared with its next `window` neighbours,
+    so the work stays near-linear in the number of rows.
+    
+    A pair matches if its mean estimated similarity over the key columns is
+    at least threshold, and each column in column_thresholds
+    ({column: minimum similarity}) reaches its own minimum. Matching pairs
+    are merged into clusters with a union-find, so a false match can chain
+    unrelated records together. A missing value is no evidence of a match:
+    a column missing in either row scores 0, and a pair needs at least two
+    columns present in both rows. With four key columns, a record with one
+    missing value scores at most 0.75, so a lower threshold lets partial
+    records match full ones.
+    
+    Returns (clusters, candidates): the cluster of every row, numbered by
+    its first row, and the number of candidate pairs compared.
+    """
+    if method not in NEAR_DUPLICATE_METHODS:
+        raise ValueError(f"Unknown near-duplicate method: {method}")
+    if num_perm % bands:
+        raise ValueError("num_perm must be a multiple of bands")
+    column_thresholds = column_thresholds or {}
+    
+    n = len(keys)
+    codes, signatures = {}, {}
+    for i, col in enumerate(keys.columns):
+        codes[col], uniques = normalize_match_values(col, keys[col])
+        signatures[col] = minhash_signatures(uniques, num_perm, (seed, i))
+    
+    # Global order of the rows by all key columns, used within blocks
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort([codes[col] for col in reversed(keys.columns)])] = np.arange(n)
+    
+    pairs = []
+    if method == 'sorted_neighbourhood':
+        for col in keys.columns:
+            # One block, ordered by this column first
+            rows = np.flatnonzero(codes[col] >= 0)
+            pairs.append(block_pairs(rows, np.zeros(len(rows), dtype=np.int64), codes[col] * n + rank, window))
+    else:
+        # Signature of each whole record: the elementwise minimum of the
+        # signatures of its values is the MinHash of all their 3-grams
+        records = np.full((n, num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        for col in keys.columns:
+            rows = np.flatnonzero(codes[col] >= 0)
+            records[rows] = np.minimum(records[rows], signatures[col][codes[col][rows]])
+        rows = np.flatnonzero(np.any([codes[col] >= 0 for col in keys.columns], axis=0))
+        rows_per_band = num_perm // bands
+        for band in range(bands):
+            band_keys = hash_rows(pd.DataFrame(records[rows, band * rows_per_band:(band + 1) * rows_per_band]))
+            pairs.append(block_pairs(rows, band_keys, rank, window))
+        del records
+    first = [a for a, _ in pairs]
+    second = [b for _, b in pairs]
+    
+    pair_ids = np.unique(np.concatenate(first) * n + np.concatenate(second)) if first else np.empty(0, dtype=np.int64)
+    a, b = pair_ids // max(n, 1), pair_ids % max(n, 1)
+    
+    # Mean similarity over all key columns; a column counts only where it
+    # is present in both rows of the pair
+    total = np.zeros(len(a))
+    shared = np.zeros(len(a))
+    passed = np.ones(len(a), dtype=bool)
+    for col in keys.columns:
+        code_a, code_b = codes[col][a], codes[col][b]
+        both = (code_a >= 0) & (code_b >= 0)
+        similarity = both.astype(np.float64)
+        differ = np.flatnonzero(both & (code_a != code_b))
+        for start in range(0, len(differ), 1000000):
+            part = differ[start:start + 1000000]
+            agree = signatures[col][code_a[part]] == signatures[col][code_b[part]]
+            similarity[part] = np.count_nonzero(agree, axis=1) / num_perm
+        if col in column_thresholds:
+            passed &= ~both | (similarity >= column_thresholds[col])
+        total += similarity
+        shared += both
+    matched = passed & (shared >= min(2, len(keys.columns))) & (total >= threshold * len(keys.columns))
+    
+    clusters = UnionFind(n)
+    clusters.union(a[matched], b[matched])
+    return clusters.roots(), len(a)
+
+
+def merge_clusters(df, clusters, duplicates):
+    """
+    The first row of every cluster with its missing values filled in from
+    the other rows of the cluster, in row order
+    
+    Returns the merged rows, indexed by the position of the first row.
+    """
+    return df[duplicates].groupby(clusters[duplicates], sort=True).first()
+
+
+# ============================================================================
+# COLUMN-PARALLEL EXECUTION
+# ============================================================================
+
+def is_numeric_column(values):
+    """True for int64/float64 columns, NumPy, nullable or Arrow-backed"""
+    return getattr(values.dtype, 'numpy_dtype', values.dtype) in ['float64', 'int64']
+
+
+def is_text_column(values):
+    """True for object and string columns, NumPy or Arrow-backed"""
+    return pd.api.types.is_string_dtype(values.dtype)
+
+
+def is_arrow_column(values):
+    """True for columns backed by Arrow arrays"""
+    return isinstance(values.dtype, pd.ArrowDtype) or getattr(values.dtype, 'storage', None) == 'pyarrow'
+
+
+def fill_missing_column(col, values, alive=None):
+    """Fill a column with its median (numeric) or mode (text) over the alive rows"""
+    remaining = values if alive is None else values[alive]
+    if is_numeric_column(values):
+        median_val = remaining.median()
+        return values.fillna(median_val), [f"  ✓ Filled '{col}' with median: {median_val:.2f}"]
+    modes = remaining.mode()
+    mode_val = modes[0] if len(modes) > 0 else "Unknown"
+    return values.fillna(mode_val), [f"  ✓ Filled '{col}' with mode: {mode_val}"]
+
+
+def fix_age_column(col, values):
+    """Convert the age column to integers, filling invalid values with the median"""
+    # Convert non-numeric values (as float64: for Arrow-backed input, coerced
+    # values come back as NaN, which Arrow does not treat as missing)
+    age = pd.to_numeric(values, errors='coerce').astype('float64')
+    if len(age) == 0:
+        return age.astype(int), [f"✓ Converted '{col}' to integer (no rows)"]
+    # Fill NaN with median
+    median_age = age.median()
+    age = age.fillna(median_age).astype(int)
+    return age, [f"✓ Converted '{col}' to integer (filled invalid values with median: {int(median_age)})"]
+
+
+def parse_date_column(col, values):
+    """Parse a date column, filling unparseable values with the most common date"""
+    parsed = values
+    try:
+        parsed, formats = DATE_PARSER.parse_column(values)
+        # Fill missing dates with mode or a default date
+        if parsed.isnull().sum() > 0:
+            modes = parsed.mode()
+            mode_date = modes[0] if len(modes) > 0 else pd.Timestamp('2024-01-01')
+            parsed = parsed.fillna(mode_date)
+        return parsed, [f"✓ Parsed '{col}' as datetime (formats: {', '.join(formats) if formats else 'none detected'})"]
+    except Exception as e:
+        return parsed, [f"✗ Could not parse '{col}': {str(e)}"]
+
+
+TEXT_OUTPUTS = ('auto', 'object', 'category', 'arrow')
+
+
+def standardize_text_column(col, values, output='auto'):
+    """
+    Trim a text column and apply consistent capitalization
+    
+    The column is dictionary-encoded first, so only its distinct values are
+    normalized and the result is rebuilt from the codes. output selects the
+    dtype of the result: 'object', 'category', 'arrow' (pyarrow-backed
+    strings) or 'auto' ('arrow' for Arrow-backed input, else 'object').
+    """
+    if output == 'auto':
+        output = 'arrow' if is_arrow_column(values) else 'object'
+    
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    
+    # Skip email columns (preserve case)
+    if 'email' in col.lower():
+        normalized = uniques.str.strip().str.lower()
+        message = f"✓ Standardized '{col}' (lowercase, trimmed)"
+    else:
+        # Title case for names, trim whitespace
+        normalized = uniques.str.strip().str.title()
+        message = f"✓ Standardized '{col}' (title case, trimmed)"
+    
+    # Several raw values can normalize to the same text ('active', 'ACTIVE')
+    new_codes, categories = pd.factorize(normalized)
+    codes = np.where(codes >= 0, new_codes[codes] if len(new_codes) else codes, -1)
+    standardized = pd.Categorical.from_codes(codes, categories=categories)
+    
+    if output == 'category':
+        result = pd.Series(standardized, index=values.index, name=values.name)
+    elif output == 'arrow':
+        result = pd.Series(standardized, index=values.index, name=values.name).astype(arrow_string_dtype())
+    else:
+        result = pd.Series(np.asarray(standardized, dtype=object), index=values.index, name=values.name)
+    return result, [message]
+
+
+def arrow_string_dtype():
+    """pyarrow-backed string dtype, or a clear error if pyarrow is not installed"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Arrow-backed strings require pyarrow: pip install pyarrow")
+    return pd.StringDtype('pyarrow')
+
+
+STRING_OUTPUTS = ('object', 'string', 'arrow')
+
+
+def optimize_column(col, values, downcast_floats=False, category=False, strings='object'):
+    """
+    Store a column in the smallest dtype that keeps its values
+    
+    Integers (NumPy, nullable or Arrow-backed) are downcast to the smallest
+    signed width that holds their range, and floats to float32 only if
+    downcast_floats is set. Text columns become 'category' if category is
+    set, otherwise strings selects 'object' (unchanged), 'string' (nullable
+    strings) or 'arrow' (pyarrow-backed strings).
+    """
+    dtype = values.dtype
+    if pd.api.types.is_integer_dtype(dtype):
+        return pd.to_numeric(values, downcast='integer'), []
+    if pd.api.types.is_float_dtype(dtype):
+        return (pd.to_numeric(values, downcast='float') if downcast_floats else values), []
+    if not is_text_column(values):
+        return values, []
+    if category:
+        return values.astype('category'), []
+    if strings == 'object' or (dtype == object and pd.api.types.infer_dtype(values, skipna=True) != 'string'):
+        # Mixed object columns stay as they are rather than have their values turned into text
+        return values, []
+    return values.astype(arrow_string_dtype() if strings == 'arrow' else pd.StringDtype()), []
+
+
+def run_column_group(group):
+    """Run (func, col, values, *args) tasks and return (col, result, messages, seconds) tuples"""
+    results = []
+    for func, col, values, *args in group:
+        start = time.perf_counter()
+        result, messages = func(col, values, *args)
+        results.append((col, result, messages, time.perf_counter() - start))
+    return results
+
+
+def run_column_group_in_worker(group):
+    """
+    run_column_group in a worker process; also returns the strings that
+    DATE_PARSER parsed there, so the parent can add them to its cache
+    """
+    DATE_PARSER.added = {}
+    try:
+        return run_column_group(group), DATE_PARSER.added
+    finally:
+        DATE_PARSER.added = None
+
+
+class ParallelColumnEngine:
+    """
+    Runs independent per-column cleaning functions in a process pool
+    
+    Columns are dealt round-robin into one group per worker and shipped as
+    pickled Series. Results are put back in the original column order, so
+    the cleaning log is identical to a serial run. With one worker (or a
+    single column) everything runs in the current process. Dates parsed in
+    the workers are added to this process's DATE_PARSER cache, so parallel
+    runs fill the cross-run cache too.
+    
+    While column_times is a list (set by StepProfiler), the time spent on
+    each column is appended to it as (col, seconds).
+    """
+    
+    def __init__(self, workers=1):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.workers = max(1, int(workers))
+        self.column_times = None
+    
+    def map(self, items):
+        """Run (func, col, values, *args) items and return (col, result, messages) in input order"""
+        items = list(items)
+        if self.workers == 1 or len(items) < 2:
+            results = run_column_group(items)
+        else:
+            n_groups = min(self.workers, len(items))
+            groups = [items[i::n_groups] for i in range(n_groups)]
+            with ProcessPoolExecutor(max_workers=n_groups) as pool:
+                group_results = list(pool.map(run_column_group_in_worker, groups))
+            
+            # Undo the round-robin split
+            results = [None] * len(items)
+            for i, (group, parsed_dates) in enumerate(group_results):
+                results[i::n_groups] = group
+                DATE_PARSER.add_to_cache(parsed_dates)
+        
+        if self.column_times is not None:
+            self.column_times.extend((col, seconds) for col, _, _, seconds in results)
+        return [(col, result, messages) for col, result, messages, _ in results]
+
+
+# ============================================================================
+# COLUMNAR I/O
+# ============================================================================
+
+# File extension -> format understood by read_data / write_data
+DATA_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'arrow',
+    '.ipc': 'arrow',
+}
+
+
+def data_format(path):
+    """Format of a data file, from its extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in DATA_FORMATS:
+        raise ValueError(f"Unknown data format: {path} (expected one of {', '.join(DATA_FORMATS)})")
+    return DATA_FORMATS[ext]
+
+
+def import_pyarrow():
+    """pyarrow and its file modules, or a clear error if it is not installed"""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet, Feather and Arrow files require pyarrow: pip install pyarrow")
+    return pa
+
+
+def arrow_to_frame(table, dtype_backend='pyarrow'):
+    """
+    Convert an Arrow table to a DataFrame
+    
+    With dtype_backend='pyarrow' every column is an ArrowDtype wrapping the
+    Arrow buffers, so nothing is copied (for memory-mapped files the data
+    stays on the page cache). Otherwise columns get NumPy dtypes.
+    """
+    if dtype_backend == 'pyarrow':
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas()
+
+
+def read_data(path, columns=None, row_groups=None, dtype_backend='pyarrow', memory_map=True):
+    """
+    Read a CSV, Parquet, Feather or Arrow IPC file into a DataFrame
+    
+    Parameters:
+    - columns: Only read these columns (column projection)
+    - row_groups: Only read these Parquet row groups / Arrow record batches
+    - dtype_backend: 'pyarrow' for Arrow-backed columns, None for NumPy dtypes
+    - memory_map: Memory-map Arrow and Parquet files instead of reading them
+    """
+    fmt = data_format(path)
+    if fmt == 'csv':
+        if row_groups is not None:
+            raise ValueError("CSV files have no row groups")
+        if dtype_backend == 'pyarrow':
+            import_pyarrow()
+            return pd.read_csv(path, usecols=columns, engine='pyarrow', dtype_backend='pyarrow')
+        return pd.read_csv(path, usecols=columns)
+    
+    pa = import_pyarrow()
+    if fmt == 'parquet':
+        parquet = pa.parquet.ParquetFile(path, memory_map=memory_map)
+        if row_groups is None:
+            table = parquet.read(columns=columns)
+        else:
+            table = parquet.read_row_groups(row_groups, columns=columns)
+    else:
+        source = pa.memory_map(path) if memory_map else pa.OSFile(path)
+        reader = pa.ipc.open_file(source)
+        if row_groups is None:
+            table = reader.read_all()
+        else:
+            table = pa.Table.from_batches([reader.get_batch(i) for i in row_groups], schema=reader.schema)
+        if columns is not None:
+            table = table.select(columns)
+    return arrow_to_frame(table, dtype_backend)
+
+
+def iter_data_batches(path, columns=None, dtype_backend='pyarrow', chunksize=100000):
+    """
+    Yield a file as DataFrames: one per Parquet row group or Arrow record
+    batch, or chunks of chunksize rows for CSV
+    """
+    fmt = data_format(path)
+    if fmt == 'csv':
+        kwargs = {'dtype_backend': 'pyarrow'} if dtype_backend == 'pyarrow' else {}
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunksize, **kwargs)
+        return
+    
+    pa = import_pyarrow()
+    if fmt == 'parquet':
+        parquet = pa.parquet.ParquetFile(path, memory_map=True)
+        for i in range(parquet.num_row_groups):
+            yield arrow_to_frame(parquet.read_row_group(i, columns=columns), dtype_backend)
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        for i in range(reader.num_record_batches):
+            table = pa.Table.from_batches([reader.get_batch(i)])
+            if columns is not None:
+                table = table.select(columns)
+            yield arrow_to_frame(table, dtype_backend)
+
+
+def write_data(df, path, compression=None, row_group_size=1000000):
+    """
+    Write a DataFrame to CSV, Parquet, Feather or Arrow IPC, keeping dtypes
+    
+    Parameters:
+    - compression: Codec (default: snappy for Parquet, lz4 for Feather and
+      none for .arrow files, which keeps them memory-mappable without copies)
+    - row_group_size: Rows per Parquet row group / Arrow record batch
+    """
+    fmt = data_format(path)
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+        return path
+    
+    pa = import_pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if fmt == 'parquet':
+        pa.parquet.write_table(table, path, compression=compression or 'snappy',
+                               row_group_size=row_group_size)
+    else:
+        if fmt == 'feather':
+            compression = compression or 'lz4'
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        with pa.ipc.new_file(path, table.schema, options=options) as writer:
+            for batch in table.to_batches(max_chunksize=row_group_size):
+                writer.write_batch(batch)
+    return path
+
+
+# ============================================================================
+# RESULT CACHE
+# ============================================================================
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of cleaning results with LRU eviction
+    
+    Every entry is the frame after one pipeline step, the log records
+    emitted up to that step and the statistics of the original input,
+    keyed by a chain of hashes: the input content, the log settings, then
+    each step name and its arguments in order. Changing a late step
+    therefore still hits the entries of the steps before it. Entries are
+    pickle files in cache_dir; a hit refreshes the file's modification
+    time, and the least recently used files are deleted once the cache
+    grows past max_bytes.
+    """
+    
+    # Bump when a step's behavior changes, so old results are not reused
+    VERSION = 1
+    
+    def __init__(self, cache_dir='.cleaning_cache', max_bytes=1024**3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def frame_key(df):
+        """Hash of a DataFrame's content, labels and dtypes"""
+        digest = hashlib.sha256()
+        digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+    
+    @staticmethod
+    def file_key(path, block_size=1024**2):
+        """Hash of a file's bytes"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    @classmethod
+    def step_key(cls, parent, step, kwargs):
+        """Key of the result of running step(**kwargs) on the result keyed by parent"""
+        config = json.dumps([cls.VERSION, parent, step, kwargs], sort_keys=True, default=str)
+        return hashlib.sha256(config.encode()).hexdigest()
+    
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+    
+    def get(self, key):
+        """Return (df, log_records, original_stats) for a key, or None"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return entry['df'], entry['log'], entry['original_stats']
+    
+    def put(self, key, df, log_records, original_stats):
+        """Store a result (written atomically), then evict down to max_bytes"""
+        tmp = f"{self.path(key)}.{os.getpid()}.tmp"
+        entry = {'df': df, 'log': log_records, 'original_stats': original_stats}
+        with open(tmp, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path(key))
+        self.evict()
+    
+    def entries(self):
+        """(mtime, size, path) of every entry, least recently used first"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.pkl'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    # Evicted by another process sharing the cache directory
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+    
+    def size(self):
+        """Total size of the cached entries in bytes"""
+        return sum(size for _, size, _ in self.entries())
+    
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+    
+    def clear(self):
+        """Delete every entry"""
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def pipeline_keys(input_key, steps, logger):
+    """
+    Cache key of the result of every step of a pipeline, in order
+    
+    The entries hold the log captured by logger, so its level and table
+    size are part of the key: a run at another level gets its own entries.
+    """
+    keys = []
+    key = ResultCache.step_key(input_key, 'log', {'level': logger.level, 'max_table_rows': logger.max_table_rows})
+    for step, kwargs in steps:
+        key = ResultCache.step_key(key, step, kwargs)
+        keys.append(key)
+    return keys
+
+
+def clean_file(path, steps, cache=None, columns=None, dtype_backend=None, **kwargs):
+    """
+    Clean a data file with a list of (step, kwargs) pairs, using a ResultCache
+    
+    The cache key starts from the hash of the file's bytes, so when the
+    final result is cached the file is not even parsed. Otherwise the file
+    is read with read_data and run through DataCleaningUtility.run_steps.
+    Other keyword arguments go to the DataCleaningUtility constructor.
+    
+    Returns the cleaner, whose df is the cleaned frame.
+    """
+    input_key = None
+    if cache is not None:
+        if kwargs.get('logger') is None:
+            kwargs['logger'] = CleaningLogger()
+        input_key = ResultCache.step_key(ResultCache.file_key(path), 'read_data',
+                                         {'columns': columns, 'dtype_backend': dtype_backend})
+        hit = cache.get(pipeline_keys(input_key, steps, kwargs['logger'])[-1]) if steps else None
+        if hit is not None:
+            df, records, original_stats = hit
+            kwargs.update(copy='inplace', lean=True, original_stats=original_stats)
+            cleaner = DataCleaningUtility(df, **kwargs)
+            cleaner.log_entry(f"✓ Cached result for '{path}' (all {len(steps)} steps skipped)")
+            cleaner.replay_log(records)
+            return cleaner
+    
+    cleaner = DataCleaningUtility(read_data(path, columns, dtype_backend=dtype_backend), **kwargs)
+    cleaner.run_steps(steps, cache, input_key)
+    return cleaner
+
+
+# ============================================================================
+# LAZY PIPELINE
+# ============================================================================
+
+class LazyCleaningPipeline:
+    """
+    Records DataCleaningUtility steps and runs them as one optimized plan
+    
+    Steps are queued with the same method names and arguments as the eager
+    API and only run when collect() is called. The optimizer:
+    - resolves every standardize_column_names step at plan time, so renames
+      only change the labels of the final frame and never rewrite data
+    - merges every row drop (missing values, duplicates) into one boolean
+      mask that is applied once, when the cleaned frame is assembled
+    - transforms each column on its own, so no step rebuilds the frame;
+      date columns are only parsed on the rows still alive
+    Statistics (medians, modes, duplicate checks) are computed on the rows
+    still alive at that point of the plan, so the result is the same as
+    running the steps eagerly in the recorded order. For the same reason a
+    column touched by several steps (fill, type fix, text standardization)
+    still gets one new Series per step: each step's statistics need the
+    values the previous step produced.
+    """
+    
+    ROW_DROP_STEPS = ('handle_missing_values', 'remove_duplicates')
+    
+    def __init__(self, cleaner):
+        """Initialize with the DataCleaningUtility whose data will be cleaned"""
+        self.cleaner = cleaner
+        self.steps = []
+    
+    def detect_missing_values(self):
+        self.steps.append(('detect_missing_values', {}))
+        return self
+    
+    def handle_missing_values(self, strategy='smart'):
+        self.steps.append(('handle_missing_values', {'strategy': strategy}))
+        return self
+    
+    def fix_data_types(self):
+        self.steps.append(('fix_data_types', {}))
+        return self
+    
+    def remove_duplicates(self, subset=None, keep='first', sample_size=20):
+        self.steps.append(('remove_duplicates', {'subset': subset, 'keep': keep, 'sample_size': sample_size}))
+        return self
+    
+    def standardize_column_names(self):
+        self.steps.append(('standardize_column_names', {}))
+        return self
+    
+    def standardize_text_data(self, output='auto'):
+        if output not in TEXT_OUTPUTS:
+            raise ValueError(f"Unknown text output: {output}")
+        self.steps.append(('standardize_text_data', {'output': output}))
+        return self
+    
+    # ========================================================================
+    # PLANNING
+    # ========================================================================
+    
+    def optimize(self):
+        """
+        Build the execution plan: a list of (step, kwargs, names) where names
+        maps each original column to the label the step sees
+        """
+        names = {col: col for col in self.cleaner.df.columns}
+        plan = []
+        for step, kwargs in self.steps:
+            plan.append((step, kwargs, dict(names)))
+            if step == 'standardize_column_names':
+                names = {col: DataCleaningUtility.clean_column_name(name) for col, name in names.items()}
+        return plan, names
+    
+    def explain(self):
+        """Log the optimized plan without running it"""
+        plan, _ = self.optimize()
+        self.cleaner.log_entry("\n" + "="*70)
+        self.cleaner.log_entry("LAZY EXECUTION PLAN")
+        self.cleaner.log_entry("="*70)
+        for i, (step, kwargs, _) in enumerate(plan, 1):
+            args = ', '.join(f"{key}={value!r}" for key, value in kwargs.items())
+            if step == 'standardize_column_names':
+                action = "labels only, resolved at plan time"
+            elif step in self.ROW_DROP_STEPS:
+                action = "row drops merged into the shared mask"
+            elif step == 'detect_missing_values':
+                action = "null count scan"
+            else:
+                action = "per-column transform"
+            self.cleaner.log_entry(f"  {i}. {step}({args}) -> {action}")
+        self.cleaner.log_entry("  Final: apply row mask once and assemble the cleaned frame")
+    
+    # ========================================================================
+    # EXECUTION
+    # ========================================================================
+    
+    def collect(self):
+        """Run the optimized plan, store the result in the cleaner and return it"""
+        df = self.cleaner.df
+        plan, final_names = self.optimize()
+        
+        self.columns = {col: df[col] for col in df.columns}
+        self.alive = np.ones(len(df), dtype=bool)
+        
+        profiler = self.cleaner.profiler
+        shape = lambda: (int(self.alive.sum()), len(self.columns))
+        for step, kwargs, names in plan:
+            self.names = names
+            if profiler is None:
+                getattr(self, f"run_{step}")(**kwargs)
+            else:
+                with profiler.step(step, shape):
+                    getattr(self, f"run_{step}")(**kwargs)
+        
+        kept = [self.columns[col][self.alive] for col in df.columns]
+        cleaned = pd.concat(kept, axis=1) if kept else df[self.alive]
+        cleaned.columns = [final_names[col] for col in df.columns]
+        
+        self.cleaner.df = cleaned
+        self.columns = {}
+        return cleaned
+    
+    def log(self, message, level='summary'):
+        self.cleaner.log_entry(message, level)
+    
+    def resolve(self, label):
+        """Original column key of the column currently called label"""
+        for col, name in self.names.items():
+            if name == label:
+                return col
+        raise KeyError(label)
+    
+    def alive_values(self, col):
+        return self.columns[col][self.alive]
+    
+    def alive_frame(self, cols):
+        return pd.DataFrame({self.names[col]: self.alive_values(col) for col in cols})
+    
+    def expand(self, col, values):
+        """
+        Full-length column from values computed for the alive rows only
+        (dead rows are missing; they are never read again)
+        """
+        if self.alive.all():
+            return values
+        positions = np.where(self.alive, np.cumsum(self.alive) - 1, -1)
+        like = self.columns[col]
+        return pd.Series(values.array.take(positions, allow_fill=True), index=like.index, name=like.name)
+    
+    def run_detect_missing_values(self):
+        self.log("\n" + "="*70)
+        self.log("1. DETECTING MISSING VALUES")
+        self.log("="*70)
+        
+        rows = self.alive.sum()
+        missing_count = pd.Series({self.names[col]: int((s.isnull().to_numpy() & self.alive).sum())
+                                   for col, s in self.columns.items()}, dtype='int64')
+        missing_df = pd.DataFrame({
+            'Column': missing_count.index,
+            'Missing_Count': missing_count.values,
+            'Missing_Percent': (missing_count / rows * 100).round(2).values
+        })
+        missing_df = missing_df[missing_df['Missing_Count'] > 0].sort_values('Missing_Count', ascending=False)
+        
+        if len(missing_df) > 0:
+            self.log(f"\nFound missing values in {len(missing_df)} columns:")
+            self.cleaner.logger.log_table(missing_df, 'detail', index=False)
+        else:
+            self.log("\n✓ No missing values found")
+    
+    def run_handle_missing_values(self, strategy):
+        self.log("\n--- HANDLING MISSING VALUES ---")
+        self.log(f"Strategy: {strategy}")
+        
+        rows_before = self.alive.sum()
+        
+        if strategy == 'drop':
+            for s in self.columns.values():
+                self.alive &= s.notnull().to_numpy()
+            self.log(f"Dropped all rows with missing values")
+            self.log(f"Rows removed: {rows_before - self.alive.sum()}")
+        
+        elif strategy == 'smart':
+            for col, s in self.columns.items():
+                nulls = s.isnull().to_numpy()
+                missing_pct = ((nulls & self.alive).sum() / self.alive.sum()) * 100
+                name = self.names[col]
+                
+                if missing_pct > 0:
+                    if is_numeric_column(s):
+                        if missing_pct < 30:
+                            median_val = self.alive_values(col).median()
+                            self.columns[col] = s.fillna(median_val)
+                            self.log(f"  ✓ Filled '{name}' with median: {median_val:.2f}", 'detail')
+                        else:
+                            self.alive &= ~nulls
+                            self.log(f"  ✓ Dropped rows with missing '{name}' (>{30}% missing)", 'detail')
+                    else:
+                        if missing_pct < 50:
+                            modes = self.alive_values(col).mode()
+                            mode_val = modes[0] if len(modes) > 0 else "Unknown"
+                            self.columns[col] = s.fillna(mode_val)
+                            self.log(f"  ✓ Filled '{name}' with mode: {mode_val}", 'detail')
+                        else:
+                            self.alive &= ~nulls
+                            self.log(f"  ✓ Dropped rows with missing '{name}' (>{50}% missing)", 'detail')
+        
+        else:
+            self.log(f"Unknown strategy: {strategy}")
+        
+        self.log(f"\nRows after handling missing values: {self.alive.sum()}")
+    
+    def log_dtypes(self, title):
+        if not self.cleaner.logger.enabled('debug'):
+            return
+        self.log(f"\n{title}:", 'debug')
+        for col, s in self.columns.items():
+            self.log(f"  {self.names[col]}: {s.dtype}", 'debug')
+    
+    def run_fix_data_types(self):
+        self.log("\n" + "="*70)
+        self.log("2. FIXING INCORRECT DATA TYPES")
+        self.log("="*70)
+        
+        self.log_dtypes("Original Data Types")
+        
+        if 'age' in self.names.values():
+            col = self.resolve('age')
+            self.log("\n--- Fixing 'age' column ---", 'detail')
+            age = pd.to_numeric(self.columns[col], errors='coerce').astype('float64')
+            if not self.alive.any():
+                # Every row was dropped: there is no median, and no value is ever read
+                self.columns[col] = age.fillna(0).astype(int)
+                self.log("✓ Converted 'age' to integer (no rows)", 'detail')
+            else:
+                median_age = age[self.alive].median()
+                self.columns[col] = age.fillna(median_age).astype(int)
+                self.log(f"✓ Converted 'age' to integer (filled invalid values with median: {int(median_age)})", 'detail')
+        
+        date_columns = [col for col, name in self.names.items() if 'date' in name.lower()]
+        
+        if date_columns:
+            self.log("\n--- Parsing Date Columns ---", 'detail')
+            for col in date_columns:
+                name = self.names[col]
+                try:
+                    # Only the alive rows are parsed, so the formats are theirs, like the eager step
+                    parsed, formats = DATE_PARSER.parse_column(self.alive_values(col))
+                    if parsed.isnull().sum() > 0:
+                        modes = parsed.mode()
+                        mode_date = modes[0] if len(modes) > 0 else pd.Timestamp('2024-01-01')
+                        parsed = parsed.fillna(mode_date)
+                    self.columns[col] = self.expand(col, parsed)
+                    self.log(f"✓ Parsed '{name}' as datetime (formats: {', '.join(formats) if formats else 'none detected'})", 'detail')
+                except Exception as e:
+                    self.log(f"✗ Could not parse '{name}': {str(e)}", 'detail')
+        
+        self.log_dtypes("Updated Data Types")
+    
+    def run_remove_duplicates(self, subset, keep, sample_size):
+        self.log("\n" + "="*70)
+        self.log("3. REMOVING DUPLICATES")
+        self.log("="*70)
+        
+        rows_before = self.alive.sum()
+        
+        if subset:
+            labels = [subset] if isinstance(subset, str) else list(subset)
+            keys = self.alive_frame([self.resolve(label) for label in labels])
+            self.log(f"\nChecking duplicates based on: {subset}")
+        else:
+            keys = self.alive_frame(list(self.columns))
+            self.log("\nChecking duplicates based on all columns")
+        
+        duplicates, drop, groups = find_duplicates(keys, keep)
+        duplicate_count = duplicates.sum()
+        
+        if duplicate_count > 0:
+            alive_positions = np.flatnonzero(self.alive)
+            sample = alive_positions[np.flatnonzero(duplicates)[:sample_size]]
+            sample_rows = pd.DataFrame({self.names[col]: self.columns[col].iloc[sample] for col in self.columns})
+            log_duplicates(self.cleaner.logger, sample_rows, duplicate_count, groups)
+            
+            self.alive[alive_positions[drop]] = False
+            rows_removed = rows_before - self.alive.sum()
+            self.log(f"\n✓ Removed {rows_removed} duplicate rows (keeping '{keep}')")
+        else:
+            self.log("\n✓ No duplicate rows found")
+        
+        self.log(f"Rows after removing duplicates: {self.alive.sum()}")
+    
+    def run_standardize_column_names(self):
+        self.log("\n" + "="*70)
+        self.log("4. STANDARDIZING COLUMN NAMES")
+        self.log("="*70)
+        
+        old_names = list(self.names.values())
+        new_names = [DataCleaningUtility.clean_column_name(name) for name in old_names]
+        self.log("\nOriginal Column Names:", 'detail')
+        self.log(lambda: f"  {old_names}", 'detail')
+        self.log("\nStandardized Column Names:", 'detail')
+        self.log(lambda: f"  {new_names}", 'detail')
+        
+        if old_names and self.cleaner.logger.enabled('detail'):
+            self.log("\nChanges made:", 'detail')
+            for old, new in zip(old_names, new_names):
+                if old != new:
+                    self.log(f"  '{old}' → '{new}'", 'detail')
+    
+    def run_standardize_text_data(self, output):
+        self.log("\n" + "="*70)
+        self.log("5. STANDARDIZING TEXT DATA")
+        self.log("="*70)
+        
+        for col, s in self.columns.items():
+            if not is_text_column(s):
+                continue
+            self.columns[col], messages = standardize_text_column(self.names[col], s, output)
+            for message in messages:
+                self.log(message, 'detail')
+
+
+# ============================================================================
+# STREAMING (OUT-OF-CORE) CLEANING
+# ============================================================================
+
+class CleaningStatistics:
+    """
+    Mergeable per-column statistics collected in one pass over CSV chunks
+    
+    Values are counted as the raw strings found in the file (other values
+    are counted by their str()), so the result does not depend on how the
+    data is split into chunks or batches, and statistics of separate
+    batches can be merged. Exact value counts are only kept for the
+    columns a cleaning decision needs: 'age', date columns and columns
+    with missing values. Other columns (IDs, amounts without gaps) only
+    keep their null count and whether their values are numeric, so memory
+    grows with the distinct values of the counted columns, not with the
+    rows. SketchStatistics bounds it for those too.
+    
+    A column is counted from the first chunk in which it has a missing
+    value. The rows seen before are recorded in uncounted_rows until
+    backfill() counts them from a second read of the same data.
+    """
+    
+    def __init__(self):
+        self.total_rows = 0
+        self.columns = []
+        self.null_counts = {}
+        self.non_numeric = {}
+        self.integer = {}
+        self.value_counts = {}
+        self.uncounted_rows = {}
+    
+    @staticmethod
+    def counted_column(col):
+        """True for the columns counted even without missing values: 'age' and dates"""
+        return col == 'age' or 'date' in str(col).lower()
+    
+    def update(self, chunk):
+        """Add one chunk (ideally read with dtype=str) to the running statistics"""
+        seen = set(self.columns)
+        self.columns += [col for col in chunk.columns if col not in seen]
+        rows_before = self.total_rows
+        self.total_rows += len(chunk)
+        
+        for col in chunk.columns:
+            values = chunk[col]
+            nulls = int(values.isnull().sum())
+            self.null_counts[col] = self.null_counts.get(col, 0) + nulls
+            if col in self.value_counts or nulls > 0 or self.counted_column(col):
+                if col not in self.value_counts and col in seen and rows_before > 0:
+                    self.uncounted_rows[col] = rows_before
+                distinct = self.count_values(col, values)
+            else:
+                distinct = pd.Series(values.dropna().unique())
+                if values.dtype != object:
+                    distinct = distinct.map(str)
+            self.add_types(col, distinct)
+    
+    def count_values(self, col, values):
+        """Add the value counts of a column's values; returns the distinct values"""
+        counts = values.value_counts()
+        if values.dtype != object:
+            counts = counts.groupby(counts.index.map(str)).sum()
+        self.value_counts.setdefault(col, Counter()).update(counts.to_dict())
+        return counts.index
+    
+    def add_types(self, col, distinct):
+        """Track whether a column's distinct values are all numeric, and all integers"""
+        parsed = pd.to_numeric(pd.Series(distinct, dtype=object), errors='coerce')
+        numeric = parsed.notnull().to_numpy()
+        self.non_numeric[col] = self.non_numeric.get(col, 0) + int((~numeric).sum())
+        if len(parsed) > 0:
+            self.integer[col] = self.integer.get(col, True) and bool(numeric.all()) and parsed.dtype.kind in 'iu'
+    
+    def backfill(self, chunks):
+        """
+        Count the rows in uncounted_rows from chunks of the same data read
+        again from the start (only the columns in uncounted_rows are needed)
+        """
+        offset = 0
+        last = max(self.uncounted_rows.values(), default=0)
+        for chunk in chunks:
+            if offset >= last:
+                break
+            for col, rows in self.uncounted_rows.items():
+                if col in chunk.columns and offset < rows:
+                    self.count_values(col, chunk[col].iloc[:rows - offset])
+            offset += len(chunk)
+        self.uncounted_rows = {}
+    
+    def empty(self):
+        """New, empty statistics of the same kind"""
+        return CleaningStatistics()
+    
+    def merge(self, other):
+        """Add the statistics of another CleaningStatistics"""
+        seen = set(self.columns)
+        rows_before = self.total_rows
+        self.columns += [col for col in other.columns if col not in seen]
+        self.total_rows += other.total_rows
+        for col in other.columns:
+            self.null_counts[col] = self.null_counts.get(col, 0) + other.null_counts.get(col, 0)
+            self.non_numeric[col] = self.non_numeric.get(col, 0) + other.non_numeric.get(col, 0)
+            if col in other.integer:
+                self.integer[col] = self.integer.get(col, True) and other.integer[col]
+        
+        # A column counted on one side only misses the other side's rows
+        for col in [col for col in self.columns if col in self.value_counts or col in other.value_counts]:
+            if col in self.value_counts:
+                uncounted = self.uncounted_rows.get(col, 0)
+            else:
+                uncounted = rows_before if col in seen else 0
+            if col in other.value_counts:
+                uncounted += other.uncounted_rows.get(col, 0)
+            elif col in other.columns:
+                uncounted += other.total_rows
+            self.value_counts.setdefault(col, Counter()).update(other.value_counts.get(col, {}))
+            if uncounted:
+                self.uncounted_rows[col] = uncounted
+        return self
+    
+    def to_dict(self):
+        """Plain dict of the statistics, for JSON state files"""
+        return {
+            'kind': 'exact',
+            'total_rows': self.total_rows,
+            'columns': self.columns,
+            'null_counts': self.null_counts,
+            'non_numeric': self.non_numeric,
+            'integer': {col: bool(flag) for col, flag in self.integer.items()},
+            'value_counts': {col: {str(value): int(count) for value, count in counts.items()}
+                             for col, counts in self.value_counts.items()},
+            'uncounted_rows': self.uncounted_rows,
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild statistics saved with to_dict"""
+        stats = cls()
+        stats.total_rows = data['total_rows']
+        stats.columns = list(data['columns'])
+        stats.null_counts = dict(data['null_counts'])
+        stats.value_counts = {col: Counter(counts) for col, counts in data['value_counts'].items()}
+        stats.uncounted_rows = dict(data.get('uncounted_rows', {}))
+        if 'non_numeric' in data:
+            stats.non_numeric = dict(data['non_numeric'])
+            stats.integer = dict(data['integer'])
+        else:
+            # Older files counted every column: keep only the counts still used
+            for col in stats.columns:
+                stats.add_types(col, list(stats.value_counts.get(col, {})))
+                if not (stats.null_counts.get(col, 0) > 0 or stats.counted_column(col)):
+                    stats.value_counts.pop(col, None)
+        return stats
+    
+    def counts(self, col):
+        """Return the value counts of a column as a Series"""
+        return pd.Series(self.value_counts.get(col, {}), dtype='int64')
+    
+    def missing_percent(self, col):
+        """Percentage of missing values in a column"""
+        if self.total_rows == 0:
+            return 0.0
+        return self.null_counts.get(col, 0) / self.total_rows * 100
+    
+    def read_dtype(self, col):
+        """
+        Dtype pandas would infer for the column when reading the whole file:
+        'int64', 'float64' or object
+        """
+        if self.non_numeric.get(col, 0) > 0:
+            return object
+        if self.null_counts.get(col, 0) == 0 and self.integer.get(col, False):
+            return 'int64'
+        return 'float64'
+    
+    def median(self, col, extra=None):
+        """Median of the numeric values of a column, plus (value, count) extra if given"""
+        counts = self.counts(col)
+        if extra is not None:
+            counts[extra[0]] = counts.get(extra[0], 0) + extra[1]
+        counts.index = pd.to_numeric(pd.Series(counts.index, dtype=object), errors='coerce')
+        return self.weighted_median(counts.groupby(level=0).sum())
+    
+    def error_note(self, col, statistic, extra=None):
+        """Note for the cleaning log on statistics that miss rows (none: counts are exact)"""
+        if col in self.uncounted_rows:
+            counted = self.total_rows - self.uncounted_rows[col]
+            return f" (from the last {counted} of {self.total_rows} rows)"
+        return ''
+    
+    @staticmethod
+    def weighted_median(counts):
+        """Median of a Series mapping numeric values to their counts"""
+        counts = counts[counts.index.notnull()].sort_index()
+        total = counts.sum()
+        if total == 0:
+            return np.nan
+        cumulative = counts.cumsum().to_numpy()
+        lower = counts.index[np.searchsorted(cumulative, (total - 1) // 2, side='right')]
+        upper = counts.index[np.searchsorted(cumulative, total // 2, side='right')]
+        return (lower + upper) / 2
+    
+    @staticmethod
+    def weighted_mode(counts):
+        """Most frequent value of a counts Series (smallest value on ties, like Series.mode)"""
+        counts = counts[counts.index.notnull()]
+        if len(counts) == 0:
+            return None
+        return counts[counts == counts.max()].sort_index().index[0]
+
+
+class CleaningState:
+    """
+    Cleaning statistics learned by fit, applied by transform
+    
+    Holds the mergeable statistics of every batch seen so far
+    (bounded-memory SketchStatistics by default, or exact
+    CleaningStatistics) and the values derived from them: fill values and row-drop columns for
+    handle_missing_values, the median age and date fallbacks for
+    fix_data_types, and the column name mapping. New batches are added with
+    partial_fit (or by merging another state), so old data never has to be
+    rescanned. Only the statistics are saved, to a JSON file (gzipped if
+    the name ends in .gz); derived values are recomputed on load. Sketches
+    keep the file at a fixed size, while exact counts of the columns with
+    missing values grow with their distinct values.
+    
+    As in streaming mode, statistics are computed once over all the data,
+    whereas the in-memory 'smart' strategy recomputes them after every
+    column-level row drop.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, strategy='smart', stats=None):
+        """Initialize with a missing value strategy ('smart' or 'drop') and optional statistics"""
+        self.strategy = strategy
+        self.stats = stats if stats is not None else SketchStatistics()
+        self.derive()
+    
+    def partial_fit(self, df):
+        """Add a batch to the statistics and update the derived values"""
+        self.stats.update(df)
+        self.derive()
+        return self
+    
+    def merge(self, other):
+        """Add the statistics of another state (fitted on other batches)"""
+        self.stats.merge(other.stats)
+        self.derive()
+        return self
+    
+    def derive(self):
+        """
+        Recompute every cleaning value from the statistics
+        
+        The decisions are kept in self.messages as (message, level) pairs,
+        in the order the cleaning log reports them.
+        """
+        stats = self.stats
+        self.read_dtypes = {col: stats.read_dtype(col) for col in stats.columns}
+        self.name_mapping = {col: DataCleaningUtility.clean_column_name(col) for col in stats.columns}
+        self.fill_values = {}
+        self.drop_columns = []
+        self.median_age = None
+        self.date_lookups = {}
+        self.date_fallbacks = {}
+        self.messages = []
+        
+        if self.strategy == 'drop':
+            self.messages.append(("Dropping all rows with missing values", 'summary'))
+        
+        elif self.strategy == 'smart':
+            for col in stats.columns:
+                missing_pct = stats.missing_percent(col)
+                
+                if missing_pct > 0:
+                    if self.read_dtypes[col] != object:
+                        if missing_pct < 30:
+                            median_val = stats.median(col)
+                            self.fill_values[col] = median_val
+                            self.messages.append((f"  ✓ Filling '{col}' with median: {median_val:.2f}"
+                                                  f"{stats.error_note(col, 'median')}", 'detail'))
+                        else:
+                            self.drop_columns.append(col)
+                            self.messages.append((f"  ✓ Dropping rows with missing '{col}' (>{30}% missing)", 'detail'))
+                    else:
+                        if missing_pct < 50:
+                            mode_val = stats.weighted_mode(stats.counts(col))
+                            mode_val = "Unknown" if mode_val is None else mode_val
+                            self.fill_values[col] = mode_val
+                            self.messages.append((f"  ✓ Filling '{col}' with mode: {mode_val}"
+                                                  f"{stats.error_note(col, 'mode')}", 'detail'))
+                        else:
+                            self.drop_columns.append(col)
+                            self.messages.append((f"  ✓ Dropping rows with missing '{col}' (>{50}% missing)", 'detail'))
+        
+        else:
+            self.messages.append((f"Unknown strategy: {self.strategy}", 'summary'))
+        
+        if 'age' in stats.columns and stats.total_rows > 0:
+            filled = None
+            if 'age' in self.fill_values and stats.null_counts.get('age', 0) > 0:
+                filled = (self.fill_values['age'], stats.null_counts['age'])
+            self.median_age = stats.median('age', filled)
+            self.messages.append((f"\nMedian 'age' for invalid values: {int(self.median_age)}"
+                                  f"{stats.error_note('age', 'median', filled)}", 'detail'))
+        
+        for col in self.date_columns():
+            counts = self.filled_counts(col)
+            # Parse each distinct string once and map batches through the lookup
+            raw = counts.index.tolist()
+            lookup = pd.Series(DATE_PARSER.parse(pd.Series(raw, dtype=object)).to_numpy(), index=raw)
+            self.date_lookups[col] = lookup
+            
+            parsed_counts = pd.Series(counts.to_numpy(), index=lookup.to_numpy())
+            mode_date = stats.weighted_mode(parsed_counts.groupby(level=0).sum())
+            self.date_fallbacks[col] = pd.Timestamp('2024-01-01') if mode_date is None else mode_date
+            self.messages.append((f"Parsed {len(raw)} distinct values of '{col}' (fallback date: {self.date_fallbacks[col].date()})", 'detail'))
+    
+    def date_columns(self):
+        """Columns parsed as dates by fix_data_types"""
+        return [col for col in self.stats.columns if 'date' in col.lower()]
+    
+    def filled_counts(self, col):
+        """Value counts of a column as they look after handle_missing_values"""
+        counts = self.stats.counts(col)
+        null_count = self.stats.null_counts.get(col, 0)
+        if col in self.fill_values and null_count > 0:
+            fill_value = self.fill_values[col]
+            counts[fill_value] = counts.get(fill_value, 0) + null_count
+        return counts
+    
+    # ========================================================================
+    # APPLYING THE STATE
+    # ========================================================================
+    
+    def handle_missing_values(self, df):
+        """Drop or fill missing values with the fitted decisions"""
+        if self.strategy == 'drop':
+            return df.dropna()
+        drop_columns = [col for col in self.drop_columns if col in df.columns]
+        if drop_columns:
+            df = df.dropna(subset=drop_columns)
+        fill_values = {col: value for col, value in self.fill_values.items() if col in df.columns}
+        if fill_values:
+            df = df.fillna(value=fill_values)
+        return df
+    
+    def fix_data_types(self, df):
+        """Convert 'age' and date columns, filling invalid values with the fitted fallbacks"""
+        if 'age' in df.columns and self.median_age is not None:
+            age = pd.to_numeric(df['age'], errors='coerce').astype('float64')
+            df['age'] = age.fillna(self.median_age).astype(int)
+        for col in self.date_columns():
+            if col not in df.columns:
+                continue
+            values = df[col]
+            parsed = values.map(self.date_lookups[col])
+            # Values never seen while fitting are parsed on the fly
+            unseen = parsed.isnull() & values.notnull()
+            if unseen.any():
+                parsed = parsed.astype(object)
+                parsed[unseen] = DATE_PARSER.parse(values[unseen]).to_numpy()
+            df[col] = pd.to_datetime(parsed).fillna(self.date_fallbacks[col])
+        return df
+    
+    def column_name(self, col):
+        """Standardized name of a column (also for columns never fitted)"""
+        return self.name_mapping.get(col) or DataCleaningUtility.clean_column_name(col)
+    
+    # ========================================================================
+    # PERSISTENCE
+    # ========================================================================
+    
+    def save(self, filename='cleaning_state.json'):
+        """Save the statistics to a JSON state file (gzipped if filename ends in .gz)"""
+        state = {'version': self.VERSION, 'strategy': self.strategy, 'stats': self.stats.to_dict()}
+        opener = gzip.open if filename.endswith('.gz') else open
+        with opener(filename, 'wt', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        print(f"\n✓ Cleaning state saved to '{filename}'")
+    
+    @classmethod
+    def load(cls, filename='cleaning_state.json'):
+        """Load a state saved with save()"""
+        opener = gzip.open if filename.endswith('.gz') else open
+        with opener(filename, 'rt', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') != cls.VERSION:
+            raise ValueError(f"Unsupported cleaning state version: {state.get('version')}")
+        stats_class = SketchStatistics if state['stats'].get('kind') == 'sketch' else CleaningStatistics
+        return cls(state['strategy'], stats_class.from_dict(state['stats']))
+
+
+class ChunkedDataCleaner:
+    """
+    Out-of-core version of the DataCleaningUtility pipeline for large CSV files
+    
+    The input (one file or a list of files with the same columns) is read in
+    chunks, three times. The first pass collects global statistics
+    (medians, modes, date fallbacks); the last pass applies
+    handle_missing_values, fix_data_types, remove_duplicates,
+    standardize_column_names and standardize_text_data to each chunk and
+    appends it to the output file. In between, a hashing pass feeds every
+    row to a HashDeduplicator, which spills to disk when needed, so
+    duplicates are found across chunks and files. keep='last' and False
+    need every key before the first chunk is written, so the hashing pass
+    and the cleaning pass both fill missing values and parse dates. Peak
+    memory depends on the chunk size, not the file size.
+    
+    Statistics are computed once over the whole input, whereas the in-memory
+    'smart' strategy recomputes them after every column-level row drop.
+    """
+    
+    def __init__(self, filepath, chunksize=100000, strategy='smart', subset=None, keep='first',
+                 dedup_memory_limit=10000000, spill_dir=None, logger=None, state=None, statistics=None):
+        """
+        Initialize with the path (or list of paths) of the CSV files to clean
+        
+        Pass a CleaningState fitted on earlier data as state to clean the
+        files consistently with it: pass 1 then only adds the new files to
+        its statistics. By default pass 1 builds SketchStatistics, whose
+        approximate medians and modes take bounded memory. Pass
+        CleaningStatistics() as statistics for exact ones, matching the
+        in-memory pipeline; their memory grows with the distinct values of
+        'age', the date columns and the columns with missing values, and
+        columns whose first missing value comes late are read once more.
+        """
+        self.filepaths = [filepath] if isinstance(filepath, str) else list(filepath)
+        self.chunksize = chunksize
+        self.strategy = strategy
+        self.subset = subset
+        self.keep = keep
+        self.dedup_memory_limit = dedup_memory_limit
+        self.spill_dir = spill_dir
+        self.stats = None
+        self.state = state
+        self.statistics = statistics
+        self.logger = logger if logger is not None else CleaningLogger()
+        self.cleaning_log = self.logger.entries
+        self.log_entry("="*70)
+        self.log_entry("DATA CLEANING LOG (STREAMING MODE)")
+        self.log_entry(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.log_entry("="*70)
+        self.log_entry(f"\nInput Files: {self.filepaths}")
+        self.log_entry(f"Chunk Size: {chunksize} rows\n")
+    
+    def log_entry(self, message, level='summary'):
+        """Add entry to cleaning log ('summary', 'detail' or 'debug')"""
+        self.logger.log(message, level)
+    
+    def read_chunks(self, dtype=None, columns=None):
+        """Iterate over the input files in chunks (only the given columns, if any)"""
+        for filepath in self.filepaths:
+            for chunk in pd.read_csv(filepath, chunksize=self.chunksize, dtype=dtype, usecols=columns):
+                yield chunk
+    
+    # ========================================================================
+    # PASS 1: GLOBAL STATISTICS
+    # ========================================================================
+    
+    def compute_statistics(self):
+        """First pass: scan the file and derive every value the cleaning steps need"""
+        self.log_entry("\n" + "="*70)
+        self.log_entry("PASS 1: COMPUTING GLOBAL STATISTICS")
+        self.log_entry("="*70)
+        
+        if self.statistics is not None:
+            stats = self.statistics
+        elif self.state is not None:
+            stats = self.state.stats.empty()
+        else:
+            stats = SketchStatistics()
+        chunk_count = 0
+        for chunk in self.read_chunks(dtype=str):
+            stats.update(chunk)
+            chunk_count += 1
+        self.stats = stats
+        
+        self.log_entry(f"\nScanned {stats.total_rows} rows in {chunk_count} chunks")
+        uncounted = getattr(stats, 'uncounted_rows', None)
+        if uncounted:
+            # Columns whose first missing value came late: count their first rows
+            self.log_entry(f"Counting the first rows of {list(uncounted)} again", 'detail')
+            stats.backfill(self.read_chunks(dtype=str, columns=list(uncounted)))
+        self.log_entry(lambda: f"Original Columns: {stats.columns}", 'detail')
+        if self.state is None:
+            self.state = CleaningState(self.strategy, stats)
+        else:
+            self.strategy = self.state.strategy
+            self.state.stats.merge(stats)
+            self.state.derive()
+            self.log_entry(f"Merged into the fitted state ({self.state.stats.total_rows} rows in total)")
+        
+        self.log_entry("\n--- HANDLING MISSING VALUES ---")
+        self.log_entry(f"Strategy: {self.strategy}")
+        for message, level in self.state.messages:
+            self.log_entry(message, level)
+        
+        return stats
+    
+    # ========================================================================
+    # PASSES 2-3: APPLY CLEANING STEPS CHUNK BY CHUNK
+    # ========================================================================
+    
+    def handle_missing_values(self, chunk):
+        """Apply the missing value decisions from pass 1 to one chunk"""
+        return self.state.handle_missing_values(chunk)
+    
+    def fix_data_types(self, chunk):
+        """Convert 'age' and date columns of one chunk using the global statistics"""
+        return self.state.fix_data_types(chunk)
+    
+    def duplicate_keys(self, chunk):
+        """64-bit hash of the duplicate-check columns of every row"""
+        return hash_rows(chunk[self.subset] if self.subset else chunk)
+    
+    def standardize_column_names(self, chunk):
+        """Rename the columns of one chunk"""
+        return chunk.rename(columns=self.state.column_name)
+    
+    def standardize_text_data(self, chunk):
+        """Trim and re-case the text columns of one chunk"""
+        for col in [col for col in chunk.columns if is_text_column(chunk[col])]:
+            chunk[col] = standardize_text_column(col, chunk[col])[0]
+        return chunk
+    
+    def prepare_chunks(self):
+        """Yield chunks with missing values and data types already fixed"""
+        date_columns = self.state.date_columns()
+        dtypes = {col: object if col in date_columns else dtype for col, dtype in self.state.read_dtypes.items()}
+        for chunk in self.read_chunks(dtype=dtypes):
+            chunk = self.handle_missing_values(chunk)
+            yield self.fix_data_types(chunk)
+    
+    def find_duplicate_rows(self):
+        """Hashing pass: return a mask of the rows remove_duplicates drops"""
+        deduplicator = HashDeduplicator(keep=self.keep, memory_limit=self.dedup_memory_limit,
+                                        spill_dir=self.spill_dir)
+        try:
+            for chunk in self.prepare_chunks():
+                deduplicator.add(self.duplicate_keys(chunk))
+            drop = deduplicator.resolve()
+        finally:
+            deduplicator.close()
+        
+        self.log_entry(f"\nDuplicate check based on: {self.subset if self.subset else 'all columns'}")
+        self.log_entry(f"Found {deduplicator.duplicate_count} duplicate rows in {deduplicator.groups} groups")
+        return drop
+    
+    def clean_to_csv(self, output_file='cleaned_data.csv'):
+        """Clean the input chunk by chunk and append each chunk to output_file"""
+        if self.stats is None:
+            self.compute_statistics()
+        
+        self.log_entry("\n" + "="*70)
+        self.log_entry("PASS 2: FINDING DUPLICATES")
+        self.log_entry("="*70)
+        
+        drop = self.find_duplicate_rows()
+        
+        self.log_entry("\n" + "="*70)
+        self.log_entry("PASS 3: CLEANING CHUNKS")
+        self.log_entry("="*70)
+        
+        rows_in = 0
+        rows_after_missing = 0
+        rows_out = 0
+        first_chunk = True
+        columns = []
+        
+        for chunk in self.prepare_chunks():
+            offset = rows_after_missing
+            rows_after_missing += len(chunk)
+            chunk = chunk[~drop[offset:rows_after_missing]]
+            chunk = self.standardize_column_names(chunk)
+            chunk = self.standardize_text_data(chunk)
+            
+            chunk.to_csv(output_file, mode='w' if first_chunk else 'a', header=first_chunk, index=False)
+            columns = list(chunk.columns)
+            first_chunk = False
+            rows_out += len(chunk)
+        rows_in = self.stats.total_rows
+        
+        self.log_entry(f"\nRows after handling missing values: {rows_after_missing}")
+        self.log_entry(f"✓ Removed {rows_after_missing - rows_out} duplicate rows (keeping '{self.keep}')")
+        self.log_entry(lambda: f"Standardized Column Names: {columns}", 'detail')
+        
+        self.log_entry("\n" + "="*70)
+        self.log_entry("CLEANING SUMMARY")
+        self.log_entry("="*70)
+        self.log_entry(f"\nRows Read: {rows_in}")
+        self.log_entry(f"Rows Written: {rows_out}")
+        if rows_in > 0:
+            self.log_entry(f"Rows Removed: {rows_in - rows_out} ({((rows_in - rows_out)/rows_in*100):.2f}%)")
+        self.log_entry(f"\n✓ Cleaned data written to '{output_file}'")
+        self.log_entry(f"Cleaned at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.log_entry("="*70)
+        
+        return rows_out
+    
+    def save_cleaning_log(self, filename='cleaning_log.txt'):
+        """Save cleaning log to file, writing it entry by entry"""
+        write_log_entries(self.cleaning_log, filename)
+        self.logger.close()
+        print(f"\n✓ Cleaning log saved to '{filename}'")
+
+
+# ============================================================================
+# APPROXIMATE STATISTICS
+# ============================================================================
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch (Karnin, Lang & Liberty, 2016)
+    
+    Values are kept in levels of "compactors"; an item on level h stands for
+    2**h original values. When a level outgrows its capacity it is sorted
+    and every other item (random offset) is promoted to the next level.
+    Memory is O(k log(n/k)) and the normalized rank error of a quantile is
+    about rank_error() with 99% confidence. Sketches of separate partitions
+    merge level by level.
+    """
+    
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+    
+    def capacity(self, level):
+        """Capacity of a level: k at the top, shrinking by 2/3 per level below"""
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+    
+    def update(self, values, weights=None):
+        """Add values (each weights[i] times, if given) and compact"""
+        values = np.asarray(values, dtype=float)
+        if weights is None:
+            weights = np.ones(len(values), dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.int64)
+        valid = ~np.isnan(values)
+        values, weights = values[valid], weights[valid]
+        if len(values) == 0:
+            return self
+        
+        # A value of weight w goes to every level h whose bit is set in w
+        for h in range(int(weights.max()).bit_length()):
+            selected = values[(weights >> h) & 1 == 1]
+            if len(selected):
+                while len(self.levels) <= h:
+                    self.levels.append(np.empty(0))
+                self.levels[h] = np.concatenate([self.levels[h], selected])
+        self.count += int(weights.sum())
+        self.compress()
+        return self
+    
+    def compress(self):
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self.capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[h])
+                odd = len(items) % 2
+                self.levels[h] = items[len(items) - odd:]
+                promoted = items[:len(items) - odd][self.rng.integers(2)::2]
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+    
+    def merge(self, other):
+        """Add the values summarized by another KLLSketch"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.count += other.count
+        self.compress()
+        return self
+    
+    def quantile(self, q):
+        """Approximate q-quantile (NaN if the sketch is empty)"""
+        if self.count == 0:
+            return np.nan
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** h) for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        i = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return values[order][min(i, len(values) - 1)]
+    
+    def rank_error(self):
+        """Normalized rank error bound (99% confidence; empirical fit of the KLL paper)"""
+        return 2.296 / self.k ** 0.9723
+    
+    def to_dict(self):
+        return {'k': self.k, 'count': self.count, 'levels': [items.tolist() for items in self.levels]}
+    
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['k'])
+        sketch.count = data['count']
+        sketch.levels = [np.asarray(items, dtype=float) for items in data['levels']]
+        return sketch
+
+
+class HeavyHitters:
+    """
+    Mergeable Misra-Gries summary of the most frequent values
+    
+    Keeps at most `capacity` counters. When there are more, the
+    (capacity+1)-th largest count is subtracted from every counter and the
+    non-positive ones are dropped. Each kept count is then low by at most
+    `error`, which never exceeds total / (capacity + 1).
+    """
+    
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype='int64')
+        self.total = 0
+        self.error = 0
+    
+    def update(self, counts):
+        """Add exact counts of a batch (a Series mapping values to counts)"""
+        self.total += int(counts.sum())
+        self.counts = self.counts.add(counts, fill_value=0).astype('int64')
+        self.prune()
+        return self
+    
+    def merge(self, other):
+        """Add another summary; the totals and the error bounds add up"""
+        self.total += other.total
+        self.error += other.error
+        self.counts = self.counts.add(other.counts, fill_value=0).astype('int64')
+        self.prune()
+        return self
+    
+    def prune(self):
+        if len(self.counts) > self.capacity:
+            threshold = int(self.counts.nlargest(self.capacity + 1).iloc[-1])
+            self.counts = self.counts - threshold
+            self.counts = self.counts[self.counts > 0]
+            self.error += threshold
+    
+    def to_dict(self):
+        return {'capacity': self.capacity, 'total': self.total, 'error': self.error,
+                'counts': {str(value): int(count) for value, count in self.counts.items()}}
+    
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls(data['capacity'])
+        summary.total = data['total']
+        summary.error = data['error']
+        summary.counts = pd.Series(data['counts'], dtype='int64')
+        return summary
+
+
+class SketchStatistics:
+    """
+    Bounded-memory, mergeable replacement for CleaningStatistics
+    
+    Per column, numeric values feed a KLLSketch (medians) and raw values a
+    HeavyHitters summary (modes), so memory no longer grows with the number
+    of distinct values. Chunks are summarized in one pass; statistics of
+    separate partitions or workers are combined with merge(). The error
+    bounds of every median and mode are reported through error_note().
+    
+    Parameters:
+    - quantile_k: KLL accuracy parameter (rank error about 1.3% at 200)
+    - heavy_hitters: Counters kept per column for modes
+    """
+    
+    kind = 'sketch'
+    
+    def __init__(self, quantile_k=200, heavy_hitters=1000):
+        self.quantile_k = quantile_k
+        self.heavy_hitters = heavy_hitters
+        self.total_rows = 0
+        self.columns = []
+        self.null_counts = {}
+        self.quantiles = {}
+        self.frequent = {}
+        self.non_numeric = {}
+        self.integer = {}
+    
+    def update(self, chunk):
+        """Add one chunk (ideally read with dtype=str) to the sketches"""
+        self.columns += [col for col in chunk.columns if col not in self.columns]
+        self.total_rows += len(chunk)
+        
+        for col in chunk.columns:
+            values = chunk[col]
+            self.null_counts[col] = self.null_counts.get(col, 0) + int(values.isnull().sum())
+            counts = values.value_counts()
+            if values.dtype != object:
+                counts = counts.groupby(counts.index.map(str)).sum()
+            self.frequent.setdefault(col, HeavyHitters(self.heavy_hitters)).update(counts)
+            
+            # Only the distinct values of the chunk are parsed
+            parsed = pd.to_numeric(pd.Series(counts.index, dtype=object), errors='coerce')
+            numeric = parsed.notnull().to_numpy()
+            self.non_numeric[col] = self.non_numeric.get(col, 0) + int((~numeric).sum())
+            self.integer[col] = self.integer.get(col, True) and numeric.all() and parsed.dtype.kind in 'iu'
+            self.quantiles.setdefault(col, KLLSketch(self.quantile_k)).update(
+                parsed.to_numpy(dtype=float)[numeric], counts.to_numpy()[numeric])
+    
+    def empty(self):
+        """New, empty sketches with the same parameters"""
+        return SketchStatistics(self.quantile_k, self.heavy_hitters)
+    
+    def merge(self, other):
+        """Add the sketches of another SketchStatistics"""
+        self.columns += [col for col in other.columns if col not in self.columns]
+        self.total_rows += other.total_rows
+        for col in other.columns:
+            self.null_counts[col] = self.null_counts.get(col, 0) + other.null_counts.get(col, 0)
+            self.non_numeric[col] = self.non_numeric.get(col, 0) + other.non_numeric.get(col, 0)
+            self.integer[col] = self.integer.get(col, True) and other.integer.get(col, True)
+            self.quantiles.setdefault(col, KLLSketch(self.quantile_k)).merge(other.quantiles[col])
+            self.frequent.setdefault(col, HeavyHitters(self.heavy_hitters)).merge(other.frequent[col])
+        return self
+    
+    def counts(self, col):
+        """Approximate counts of the most frequent values of a column"""
+        return self.frequent[col].counts.copy() if col in self.frequent else pd.Series(dtype='int64')
+    
+    def missing_percent(self, col):
+        """Percentage of missing values in a column"""
+        if self.total_rows == 0:
+            return 0.0
+        return self.null_counts.get(col, 0) / self.total_rows * 100
+    
+    def read_dtype(self, col):
+        """Dtype pandas would infer for the column: 'int64', 'float64' or object"""
+        if self.non_numeric.get(col, 0) > 0:
+            return object
+        if self.null_counts.get(col, 0) == 0 and self.integer.get(col) and self.quantiles[col].count > 0:
+            return 'int64'
+        return 'float64'
+    
+    def quantile_sketch(self, col, extra=None):
+        """KLL sketch of a column, with (value, count) extra added to a copy if given"""
+        sketch = self.quantiles.get(col, KLLSketch(self.quantile_k))
+        if extra is not None:
+            value = pd.to_numeric(pd.Series([extra[0]], dtype=object), errors='coerce')[0]
+            sketch = KLLSketch.from_dict(sketch.to_dict()).update([value], [extra[1]])
+        return sketch
+    
+    def median(self, col, extra=None):
+        """Approximate median of the numeric values, plus (value, count) extra if given"""
+        return self.quantile_sketch(col, extra).quantile(0.5)
+    
+    def error_note(self, col, statistic, extra=None):
+        """Error bound of a 'median' or 'mode', for the cleaning log"""
+        if statistic == 'median':
+            sketch = self.quantile_sketch(col, extra)
+            eps = sketch.rank_error()
+            return (f" (±{eps:.1%} rank error: {sketch.quantile(0.5 - eps):.2f}"
+                    f" to {sketch.quantile(0.5 + eps):.2f})")
+        error = self.frequent[col].error
+        return f" (counts low by at most {error})" if error else " (exact)"
+    
+    weighted_mode = staticmethod(CleaningStatistics.weighted_mode)
+    
+    def to_dict(self):
+        """Plain dict of the sketches, for JSON state files"""
+        return {
+            'kind': self.kind,
+            'quantile_k': self.quantile_k,
+            'heavy_hitters': self.heavy_hitters,
+            'total_rows': self.total_rows,
+            'columns': self.columns,
+            'null_counts': self.null_counts,
+            'non_numeric': self.non_numeric,
+            'integer': {col: bool(flag) for col, flag in self.integer.items()},
+            'quantiles': {col: sketch.to_dict() for col, sketch in self.quantiles.items()},
+            'frequent': {col: summary.to_dict() for col, summary in self.frequent.items()},
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild sketches saved with to_dict"""
+        stats = cls(data['quantile_k'], data['heavy_hitters'])
+        stats.total_rows = data['total_rows']
+        stats.columns = list(data['columns'])
+        stats.null_counts = dict(data['null_counts'])
+        stats.non_numeric = dict(data['non_numeric'])
+        stats.integer = dict(data['integer'])
+        stats.quantiles = {col: KLLSketch.from_dict(sketch) for col, sketch in data['quantiles'].items()}
+        stats.frequent = {col: HeavyHitters.from_dict(summary) for col, summary in data['frequent'].items()}
+        return stats
+
+
+# ============================================================================
+# BATCH PROCESSING
+# ============================================================================
+
+# Defaults for batch runs; a JSON config file overrides any of these keys.
+# optimize_memory is left out: its dtypes depend on each file's values, so
+# the files of one batch would not share a schema
+DEFAULT_BATCH_CONFIG = {
+    'steps': [
+        ['detect_missing_values', {}],
+        ['handle_missing_values', {'strategy': 'smart'}],
+        ['fix_data_types', {}],
+        ['remove_duplicates', {}],
+        ['standardize_column_names', {}],
+        ['standardize_text_data', {}],
+        ['generate_report', {}],
+    ],
+    'output_format': 'csv',
+    'log_level': 'detail',
+    'dtype_backend': None,
+    'cache_dir': None,
+    'cache_max_bytes': 1024**3,
+}
+
+BATCH_STEPS = ('detect_missing_values', 'handle_missing_values', 'fix_data_types', 'remove_duplicates',
+               'standardize_column_names', 'standardize_text_data', 'optimize_memory', 'generate_report')
+
+
+def load_batch_config(filename=None):
+    """Default batch config, updated with a JSON config file if given"""
+    config = dict(DEFAULT_BATCH_CONFIG)
+    if filename:
+        with open(filename, encoding='utf-8') as f:
+            config.update(json.load(f))
+    for step, _ in config['steps']:
+        if step not in BATCH_STEPS:
+            raise ValueError(f"Unknown step in config: {step}")
+    if f".{config['output_format']}" not in DATA_FORMATS:
+        raise ValueError(f"Unknown output format: {config['output_format']}")
+    return config
+
+
+def find_input_files(patterns, recursive=False):
+    """Expand globs and directories into a sorted list of data files"""
+    files = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '**', '*') if recursive else os.path.join(pattern, '*')
+        for path in glob.glob(pattern, recursive=recursive):
+            if os.path.isfile(path) and os.path.splitext(path)[1].lower() in DATA_FORMATS:
+                files.add(os.path.abspath(path))
+    return sorted(files)
+
+
+def output_names(files):
+    """Unique output base name for every input file"""
+    names = {}
+    used = Counter()
+    for path in files:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        used[stem] += 1
+        names[path] = stem if used[stem] == 1 else f"{stem}_{used[stem]}"
+    return names
+
+
+def clean_batch_file(path, output_path, log_path, config):
+    """
+    Clean one file of a batch (runs in a worker process)
+    
+    Never raises: failures are written to the file's log and returned as a
+    'failed' result, so one bad file cannot stop the batch.
+    """
+    start = time.perf_counter()
+    logger = CleaningLogger(level=config['log_level'], echo=False)
+    try:
+        cache = None
+        if config['cache_dir']:
+            cache = ResultCache(config['cache_dir'], config['cache_max_bytes'])
+        steps = [(step, kwargs) for step, kwargs in config['steps']]
+        cleaner = clean_file(path, steps, cache, dtype_backend=config['dtype_backend'],
+                             logger=logger, lean=True, copy='inplace')
+        write_data(cleaner.df, output_path)
+        write_log_entries(cleaner.cleaning_log, log_path)
+        return {'file': path, 'status': 'ok', 'rows_in': cleaner.original_stats['rows'],
+                'rows_out': len(cleaner.df), 'seconds': time.perf_counter() - start,
+                'output': output_path, 'log': log_path}
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        write_log_entries(list(logger.entries) + ["\n✗ FAILED: " + error, traceback.format_exc()], log_path)
+        return {'file': path, 'status': 'failed', 'error': error,
+                'seconds': time.perf_counter() - start, 'log': log_path}
+
+
+def run_batch(patterns, output_dir='cleaned', config=None, workers=None, recursive=False, max_attempts=2):
+    """
+    Clean many files concurrently in a bounded process pool
+    
+    Parameters:
+    - patterns: Globs and/or directories of CSV, Parquet, Feather or Arrow files
+    - output_dir: Where <name>_cleaned.<format> and <name>_cleaning_log.txt go,
+      plus batch_summary.json
+    - config: Batch config dict (see DEFAULT_BATCH_CONFIG)
+    - workers: Number of worker processes (default: one per CPU core)
+    - max_attempts: Runs per file when a worker process dies (e.g. out of
+      memory); failures inside a file never affect the others
+    
+    Returns the per-file results.
+    """
+    config = config or load_batch_config()
+    workers = workers or os.cpu_count() or 1
+    files = find_input_files(patterns, recursive)
+    os.makedirs(output_dir, exist_ok=True)
+    names = output_names(files)
+    print(f"Cleaning {len(files)} files with {workers} workers -> '{output_dir}'")
+    
+    results = {}
+    attempts = Counter()
+    pending = list(files)
+    rows_done = 0
+    start = time.perf_counter()
+    
+    while pending:
+        retry = []
+        # A dead worker breaks its whole pool, failing every file still in it,
+        # so retries get a pool of their own to keep a crash from spreading
+        groups = [pending] if not attempts else [[path] for path in pending]
+        for group in groups:
+            with ProcessPoolExecutor(max_workers=min(workers, len(group))) as pool:
+                futures = {}
+                for path in group:
+                    attempts[path] += 1
+                    output_path = os.path.join(output_dir, f"{names[path]}_cleaned.{config['output_format']}")
+                    log_path = os.path.join(output_dir, f"{names[path]}_cleaning_log.txt")
+                    futures[pool.submit(clean_batch_file, path, output_path, log_path, config)] = path
+                
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # The worker process died (e.g. killed for running out of memory)
+                        if attempts[path] < max_attempts:
+                            retry.append(path)
+                            continue
+                        result = {'file': path, 'status': 'failed', 'error': f"worker died: {e!r}", 'seconds': 0.0}
+                    results[path] = result
+                    
+                    elapsed = time.perf_counter() - start
+                    if result['status'] == 'ok':
+                        rows_done += result['rows_in']
+                        line = (f"✓ {os.path.basename(path)}: {result['rows_in']} -> {result['rows_out']} rows"
+                                f" in {result['seconds']:.2f}s")
+                    else:
+                        line = f"✗ {os.path.basename(path)}: {result['error']}"
+                    print(f"[{len(results)}/{len(files)}] {line} | {rows_done / elapsed:,.0f} rows/s overall")
+        pending = retry
+    
+    elapsed = time.perf_counter() - start
+    failed = [r for r in results.values() if r['status'] != 'ok']
+    summary = {
+        'files': len(files),
+        'succeeded': len(files) - len(failed),
+        'failed': len(failed),
+        'rows': rows_done,
+        'seconds': elapsed,
+        'rows_per_second': rows_done / elapsed if elapsed > 0 else None,
+        'results': [results[path] for path in files],
+    }
+    with open(os.path.join(output_dir, 'batch_summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    
+    print(f"\n{summary['succeeded']} of {len(files)} files cleaned, {len(failed)} failed, "
+          f"{rows_done:,} rows in {elapsed:.1f}s ({summary['rows_per_second'] or 0:,.0f} rows/s)")
+    for result in failed:
+        print(f"  ✗ {result['file']}: {result['error']}")
+    return summary['results']
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main():
+    """Main function to demonstrate data cleaning"""
+    print("\n" + "="*70)
+    print(" "*15 + "DATA CLEANING UTILITY")
+    print(" "*10 + "Syntecxhub Data Science Internship")
+    print(" "*20 + "Week 1 - Project 3")
+    print("="*70 + "\n")
+    
+    # Generate dirty data
+    dirty_df = generate_dirty_data()
+    
+    print("\n" + "="*70)
+    print("DIRTY DATA PREVIEW")
+    print("="*70)
+    print(dirty_df.head(10))
+    print(f"\nShape: {dirty_df.shape}")
+    print(f"Missing values: {dirty_df.isnull().sum().sum()}")
+    
+    # Initialize cleaning utility
+    cleaner = DataCleaningUtility(dirty_df)
+    
+    # Perform cleaning steps
+    cleaner.detect_missing_values()
+    cleaner.handle_missing_values(strategy='smart')
+    cleaner.fix_data_types()
+    cleaner.remove_duplicates(subset=['Customer ID'])
+    cleaner.standardize_column_names()
+    cleaner.standardize_text_data()
+    cleaner.optimize_memory()
+    
+    # Generate report
+    cleaner.generate_report()
+    
+    # Get cleaned data
+    cleaned_df = cleaner.get_cleaned_data()
+    
+    print("\n" + "="*70)
+    print("CLEANED DATA PREVIEW")
+    print("="*70)
     print(cleaned_df.head(10))
     print(f"\nShape: {cleaned_df.shape}")
     print(f"Missing values: {cleaned_df.isnull().sum().sum()}")
@@ -451,5 +3808,26 @@ def main():
     print("="*70 + "\n")
 
 
-if __name__ == "__main__":
+def cli(argv=None):
+    """Command-line entry point: no arguments runs the demo, 'batch' cleans files"""
+    parser = argparse.ArgumentParser(description="Data cleaning utility")
+    commands = parser.add_subparsers(dest='command')
+    
+    batch = commands.add_parser('batch', help="clean many files concurrently")
+    batch.add_argument('inputs', nargs='+', help="globs or directories of input files")
+    batch.add_argument('-o', '--output-dir', default='cleaned')
+    batch.add_argument('-c', '--config', help="JSON config file (steps, output_format, log_level, ...)")
+    batch.add_argument('-w', '--workers', type=int, help="worker processes (default: CPU cores)")
+    batch.add_argument('-r', '--recursive', action='store_true', help="also search subdirectories")
+    
+    args = parser.parse_args(argv)
+    if args.command == 'batch':
+        results = run_batch(args.inputs, args.output_dir, load_batch_config(args.config),
+                            args.workers, args.recursive)
+        return 1 if any(r['status'] != 'ok' for r in results) else 0
     main()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
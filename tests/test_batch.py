@@ -0,0 +1,20 @@
+"""Tests for batch processing of many files"""
+
+import pandas as pd
+
+from data_cleaning_utility import cli, generate_synthetic_data, run_batch
+
+
+def test_header_only_file_counts_as_cleaned(tmp_path):
+    inputs = tmp_path / 'in'
+    inputs.mkdir()
+    generate_synthetic_data(rows=50, seed=2, output=str(inputs / 'full.csv'))
+    header = pd.read_csv(inputs / 'full.csv', nrows=0)
+    header.to_csv(inputs / 'empty.csv', index=False)
+    
+    results = run_batch([str(inputs)], str(tmp_path / 'out'), workers=1)
+    assert [r['status'] for r in results] == ['ok', 'ok']
+    assert results[0]['rows_in'] == 0
+    assert pd.read_csv(tmp_path / 'out' / 'empty_cleaned.csv').empty
+    assert cli(['batch', str(inputs), '--output-dir', str(tmp_path / 'out2'), '--workers', '1']) == 0
+
@@ -0,0 +1,103 @@
+"""Tests for the on-disk ResultCache and cached pipeline runs"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from data_cleaning_utility import (CleaningLogger, DataCleaningUtility, ResultCache, clean_file,
+                                   generate_synthetic_data)
+
+STEPS = [
+    ('handle_missing_values', {'strategy': 'smart'}),
+    ('fix_data_types', {}),
+    ('remove_duplicates', {'subset': ['Customer ID']}),
+    ('standardize_column_names', {}),
+]
+
+
+@pytest.fixture
+def dirty_csv(tmp_path):
+    return generate_synthetic_data(rows=300, seed=6, output=str(tmp_path / 'dirty.csv'))
+
+
+def quiet(level='detail'):
+    return CleaningLogger(level=level, echo=False)
+
+
+def fail_if_called(*args, **kwargs):
+    raise AssertionError("step ran despite a cache hit")
+
+
+def test_full_hit_skips_every_step(dirty_csv, tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    first = clean_file(dirty_csv, STEPS, cache, logger=quiet())
+    
+    for step, _ in STEPS:
+        monkeypatch.setattr(DataCleaningUtility, step, fail_if_called)
+    monkeypatch.setattr('data_cleaning_utility.read_data', fail_if_called)
+    second = clean_file(dirty_csv, STEPS, cache, logger=quiet())
+    
+    assert second.df.equals(first.df)
+    assert any("all 4 steps skipped" in str(entry) for entry in second.cleaning_log)
+    # The steps' log is replayed as it was written
+    def step_log(cleaner):
+        log = [str(entry) for entry in cleaner.cleaning_log]
+        return log[log.index('\n--- HANDLING MISSING VALUES ---'):]
+    assert step_log(second) == step_log(first)
+
+
+def test_partial_hit_runs_only_new_steps(dirty_csv, tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    clean_file(dirty_csv, STEPS[:2], cache, logger=quiet())
+    
+    cached = clean_file(dirty_csv, STEPS, cache, logger=quiet())
+    fresh = clean_file(dirty_csv, STEPS, logger=quiet())
+    assert cached.df.equals(fresh.df)
+    assert any("first 2 of 4 steps" in str(entry) for entry in cached.cleaning_log)
+
+
+def test_key_changes_with_input_and_log_settings(dirty_csv, tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    clean_file(dirty_csv, STEPS, cache, logger=quiet())
+    entries = len(cache.entries())
+    
+    # Another log level captures other records, so it gets its own entries
+    clean_file(dirty_csv, STEPS, cache, logger=quiet('summary'))
+    assert len(cache.entries()) == 2 * entries
+    
+    df = pd.read_csv(dirty_csv)
+    df.loc[0, 'age'] = 99
+    df.to_csv(dirty_csv, index=False)
+    changed = clean_file(dirty_csv, STEPS, cache, logger=quiet())
+    assert not any("Cached result" in str(entry) for entry in changed.cleaning_log)
+    assert len(cache.entries()) == 3 * entries
+
+
+def test_eviction_keeps_recently_used_entries(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=10**9)
+    df = pd.DataFrame({'x': range(1000)})
+    for i, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, df, [], {'rows': 1000})
+        os.utime(cache.path(key), (1000 + i, 1000 + i))
+    entry_size = cache.size() // 3
+    
+    # Reading 'a' makes it the most recently used
+    assert cache.get('a')[0].equals(df)
+    cache.max_bytes = 2 * entry_size + entry_size // 2
+    cache.put('d', df, [], {'rows': 1000})
+    
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('d') is not None
+    assert cache.size() <= cache.max_bytes
+    
+    cache.clear()
+    assert cache.entries() == []
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache'))
+    with open(cache.path('broken'), 'wb') as f:
+        f.write(b'not a pickle')
+    assert cache.get('broken') is None
+    assert cache.get('missing') is None
@@ -0,0 +1,86 @@
+"""Tests for exact deduplication: row hashing and the out-of-core HashDeduplicator"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_cleaning_utility import (ChunkedDataCleaner, CleaningLogger, CleaningStatistics,
+                                   HashDeduplicator, find_duplicates, generate_synthetic_data, hash_rows)
+
+
+def random_hashes(n, distinct, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, np.iinfo(np.uint64).max, size=distinct, dtype=np.uint64, endpoint=True)
+    return values[rng.integers(0, distinct, size=n)]
+
+
+def deduplicate(hashes, keep, chunk=997, **options):
+    deduplicator = HashDeduplicator(keep=keep, **options)
+    try:
+        for start in range(0, len(hashes), chunk):
+            deduplicator.add(hashes[start:start + chunk])
+        spilled = len(deduplicator.files)
+        return deduplicator.resolve(), deduplicator, spilled
+    finally:
+        deduplicator.close()
+
+
+@pytest.mark.parametrize('keep', ['first', 'last', False])
+@pytest.mark.parametrize('memory_limit', [10**9, 1500])
+def test_keep_rules_across_chunks(keep, memory_limit, tmp_path):
+    hashes = random_hashes(20000, 12000)
+    drop, deduplicator, spilled = deduplicate(hashes, keep, memory_limit=memory_limit,
+                                              spill_dir=str(tmp_path / 'spill'))
+    expected = pd.Series(hashes).duplicated(keep=keep).to_numpy()
+    assert np.array_equal(drop, expected)
+    assert deduplicator.duplicate_count == int(pd.Series(hashes).duplicated(keep=False).sum())
+    assert (spilled > 0) == (memory_limit < len(hashes))
+    assert not os.path.exists(tmp_path / 'spill') or not os.listdir(tmp_path / 'spill')
+
+
+@pytest.mark.parametrize('partitions', [1, 7, 100, 256])
+def test_every_partition_is_used_evenly(partitions):
+    hashes = hash_rows(pd.DataFrame({'id': np.arange(50000)}))
+    deduplicator = HashDeduplicator(partitions=partitions)
+    deduplicator.add(hashes)
+    sizes = np.array([sum(len(records) for records in buffer) for buffer in deduplicator.buffers])
+    assert sizes.sum() == len(hashes)
+    assert sizes.min() > 0.7 * len(hashes) / partitions
+    
+    # Partitions hold their records in row order
+    for p in range(partitions):
+        rows = deduplicator.load_partition(p)['row']
+        assert np.all(np.diff(rows) > 0)
+
+
+def test_partitions_must_be_positive():
+    with pytest.raises(ValueError):
+        HashDeduplicator(partitions=0)
+
+
+def test_find_duplicates_matches_pandas():
+    df = pd.DataFrame({'a': [1, 2, 1, 3, 1], 'b': ['x', 'y', 'x', 'y', 'z']})
+    for keep in ('first', 'last', False):
+        duplicates, drop, groups = find_duplicates(df, keep)
+        assert drop.tolist() == df.duplicated(keep=keep).tolist()
+        assert duplicates.tolist() == df.duplicated(keep=False).tolist()
+        assert groups == 1
+    assert len(set(hash_rows(df).tolist())) == 4
+
+
+@pytest.mark.parametrize('keep', ['first', 'last', False])
+def test_streaming_spill_matches_in_memory(tmp_path, keep):
+    path = str(tmp_path / 'dirty.csv')
+    generate_synthetic_data(rows=1500, duplicate_rate=0.2, seed=4, output=path)
+    outputs = []
+    for memory_limit in (10**9, 100):
+        output = str(tmp_path / f'out_{memory_limit}.csv')
+        cleaner = ChunkedDataCleaner(path, chunksize=200, keep=keep, subset=['Customer ID'],
+                                     dedup_memory_limit=memory_limit, spill_dir=str(tmp_path / 'spill'),
+                                     logger=CleaningLogger(echo=False), statistics=CleaningStatistics())
+        cleaner.clean_to_csv(output)
+        outputs.append(pd.read_csv(output))
+    assert outputs[0].equals(outputs[1])
+    assert outputs[0]['customer_id'].is_unique
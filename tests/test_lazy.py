@@ -0,0 +1,42 @@
+"""Tests for the lazy pipeline against the eager steps"""
+
+import numpy as np
+import pytest
+
+from data_cleaning_utility import CleaningLogger, DataCleaningUtility, generate_synthetic_data
+
+
+@pytest.fixture(scope='module')
+def dirty():
+    return generate_synthetic_data(rows=400, missing_rate=0.05, duplicate_rate=0.1, seed=9)
+
+
+def run_both(df, strategy='smart', subset=None, keep='first'):
+    eager = DataCleaningUtility(df, logger=CleaningLogger(echo=False))
+    eager.handle_missing_values(strategy)
+    eager.fix_data_types()
+    eager.remove_duplicates(subset=subset, keep=keep)
+    eager.standardize_column_names()
+    eager.standardize_text_data()
+    
+    lazy = DataCleaningUtility(df, logger=CleaningLogger(echo=False))
+    (lazy.lazy().handle_missing_values(strategy).fix_data_types().remove_duplicates(subset=subset, keep=keep)
+     .standardize_column_names().standardize_text_data().collect())
+    return eager, lazy
+
+
+@pytest.mark.parametrize('subset', [None, 'Customer ID', ['Customer ID', 'Email Address']])
+@pytest.mark.parametrize('keep', ['first', 'last', False])
+def test_lazy_matches_eager(dirty, subset, keep):
+    eager, lazy = run_both(dirty, subset=subset, keep=keep)
+    assert lazy.df.equals(eager.df)
+    assert (lazy.df.dtypes == eager.df.dtypes).all()
+    assert lazy.cleaning_log[5:] == eager.cleaning_log[5:]
+
+
+def test_lazy_with_every_row_dropped(dirty):
+    df = dirty.assign(CITY=np.nan)
+    eager, lazy = run_both(df, strategy='drop')
+    assert len(lazy.df) == 0
+    assert lazy.df.equals(eager.df)
+    assert (lazy.df.dtypes == eager.df.dtypes).all()
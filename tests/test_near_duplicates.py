@@ -0,0 +1,116 @@
+"""Tests for near-duplicate detection: union-find, clustering and precision"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_cleaning_utility import (CleaningLogger, DataCleaningUtility, UnionFind,
+                                   find_near_duplicates, generate_synthetic_data, match_columns)
+
+
+def cleaner(df):
+    return DataCleaningUtility(df, logger=CleaningLogger(echo=False))
+
+
+def people():
+    return pd.DataFrame({
+        'first_name': ['Alice', 'Bob', 'alice ', 'Carol', 'ALICE', 'Bob'],
+        'last_name': ['Smith', 'Jones', 'smith', 'White', 'Smith', 'Brown'],
+        'email': ['alice@mail.com', 'bob@mail.com', 'ALICE@MAIL.COM', 'carol@mail.com', None, 'bob@corp.org'],
+        'phone': ['555-0100', '555-0199', '(555) 0100', '555-0142', '5550100', '555-0777'],
+    })
+
+
+def test_union_find_chains_to_smallest_row():
+    sets = UnionFind(8)
+    sets.union(np.array([5, 3, 6]), np.array([3, 1, 7]))
+    sets.union(np.array([7]), np.array([2]))
+    assert sets.roots().tolist() == [0, 1, 2, 1, 4, 1, 2, 2]
+
+
+def test_union_find_many_pairs():
+    rng = np.random.default_rng(0)
+    a, b = rng.integers(0, 1000, 3000), rng.integers(0, 1000, 3000)
+    sets = UnionFind(1000)
+    sets.union(a, b)
+    roots = sets.roots()
+    
+    # Same result as merging the pairs one at a time
+    parent = list(range(1000))
+    def find(x):
+        while parent[x] != x:
+            x = parent[x]
+        return x
+    for x, y in zip(a, b):
+        rx, ry = find(x), find(y)
+        parent[max(rx, ry)] = min(rx, ry)
+    assert roots.tolist() == [find(x) for x in range(1000)]
+
+
+@pytest.mark.parametrize('method', ['minhash', 'sorted_neighbourhood'])
+def test_find_near_duplicates_clusters(method):
+    clusters, candidates = find_near_duplicates(people(), method=method)
+    assert clusters.tolist() == [0, 1, 0, 3, 4, 5]
+    assert candidates > 0
+    
+
+
+def test_partial_record_needs_lower_threshold():
+    # Row 4 has no email: it only matches once the threshold allows a gap
+    method = 'sorted_neighbourhood'
+    clusters, _ = find_near_duplicates(people(), method=method)
+    assert clusters.tolist() == [0, 1, 0, 3, 4, 5]
+    clusters, _ = find_near_duplicates(people(), threshold=0.75, method=method)
+    assert clusters.tolist() == [0, 1, 0, 3, 0, 5]
+
+
+def test_one_sided_missing_values_do_not_match():
+    keys = pd.DataFrame({'name': ['Ann Lee', 'Ann Lee', 'Ann Lee'],
+                         'email': ['ann1@x.com', None, 'ann2@x.com'],
+                         'phone': [None, '555-0001', '555-0002']})
+    clusters, _ = find_near_duplicates(keys, threshold=0.3)
+    assert clusters.tolist() == [0, 1, 2]
+
+
+def test_keep_merge_fills_from_cluster():
+    df = people().assign(city=['Lagos', None, None, 'Kano', 'Abuja', None])
+    c = cleaner(df)
+    c.remove_duplicates(subset=['first_name', 'last_name', 'email', 'phone'], keep='merge',
+                        fuzzy={'threshold': 0.75, 'method': 'sorted_neighbourhood'})
+    assert len(c.df) == 4
+    assert c.df['city'].tolist() == ['Lagos', None, 'Kano', None]
+
+
+def test_string_subset_is_one_column():
+    df = people()
+    c = cleaner(df)
+    c.remove_duplicates(subset='email', fuzzy=True)
+    # Rows 0 and 2 share an email; the row without one is kept
+    assert c.df.index.tolist() == [0, 1, 3, 4, 5]
+
+
+def test_precision_on_distinct_synthetic_records():
+    # Every row is a different customer: nothing may be merged
+    df = generate_synthetic_data(rows=20000, duplicate_rate=0, missing_rate=0.05, seed=7)
+    for method in ('minhash', 'sorted_neighbourhood'):
+        clusters, _ = find_near_duplicates(df[match_columns(df)], method=method)
+        assert len(np.unique(clusters)) >= 0.999 * len(df)
+
+
+def test_recall_on_injected_near_duplicates():
+    df = generate_synthetic_data(rows=5000, duplicate_rate=0, missing_rate=0, seed=3,
+                                 text_cardinality=1000)
+    rng = np.random.default_rng(3)
+    source = np.sort(rng.choice(len(df), 250, replace=False))
+    near = df.iloc[source].copy()
+    near['Email Address'] = near['Email Address'].str.upper()
+    near['First Name'] = near['First Name'].str.swapcase()
+    near['Phone_Number'] = near['Phone_Number'].str.replace('-', ' ')
+    near['Customer ID'] += len(df)
+    data = pd.concat([df, near], ignore_index=True)
+    
+    clusters, _ = find_near_duplicates(data[match_columns(data)])
+    found = clusters[len(df):] == source
+    assert found.mean() >= 0.95
+    # and no other rows were merged
+    assert len(np.unique(clusters)) == len(df)
@@ -0,0 +1,54 @@
+"""Tests for the mergeable sketches behind approximate statistics"""
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning_utility import HeavyHitters, KLLSketch
+
+
+def value_counts(values):
+    return pd.Series(values).value_counts()
+
+
+def test_heavy_hitters_merge_adds_totals():
+    rng = np.random.default_rng(0)
+    a = rng.zipf(1.5, size=10000) % 500
+    b = rng.zipf(1.5, size=10000) % 500
+    left = HeavyHitters(capacity=50).update(value_counts(a))
+    right = HeavyHitters(capacity=50).update(value_counts(b))
+    
+    merged = left.merge(right)
+    assert merged.total == 20000
+    assert merged.error <= merged.total / (merged.capacity + 1)
+    
+    # Every kept count is low by at most the error bound
+    exact = value_counts(np.concatenate([a, b]))
+    for value, count in merged.counts.items():
+        assert exact[value] - merged.error <= count <= exact[value]
+
+
+def test_heavy_hitters_merge_survives_round_trip():
+    left = HeavyHitters(capacity=3).update(value_counts(list('aaabbc')))
+    right = HeavyHitters(capacity=3).update(value_counts(list('aadddde')))
+    merged = HeavyHitters.from_dict(left.merge(right).to_dict())
+    assert merged.total == 13
+    assert merged.counts.idxmax() == 'a'
+
+
+def test_kll_merge_matches_single_sketch():
+    rng = np.random.default_rng(1)
+    a = rng.normal(0, 1, size=50000)
+    b = rng.normal(5, 1, size=50000)
+    merged = KLLSketch(k=200, seed=1).update(a).merge(KLLSketch(k=200, seed=2).update(b))
+    
+    assert merged.count == 100000
+    values = np.sort(np.concatenate([a, b]))
+    for q in (0.1, 0.25, 0.5, 0.75, 0.9):
+        rank = np.searchsorted(values, merged.quantile(q)) / len(values)
+        assert abs(rank - q) <= merged.rank_error()
+
+
+def test_kll_merge_with_empty_sketch():
+    sketch = KLLSketch().update([1.0, 2.0, 3.0])
+    assert sketch.merge(KLLSketch()).quantile(0.5) == 2.0
+    assert KLLSketch().merge(sketch).count == 3
@@ -0,0 +1,92 @@
+"""Tests for CleaningState: fit, persistence and merging"""
+
+import gzip
+import json
+
+import pandas as pd
+import pytest
+
+from data_cleaning_utility import (CleaningLogger, CleaningState, CleaningStatistics,
+                                   DataCleaningUtility, SketchStatistics, generate_synthetic_data)
+
+
+@pytest.fixture(scope='module')
+def history():
+    return generate_synthetic_data(rows=4000, missing_rate=0.05, seed=11)
+
+
+def cleaner(df):
+    return DataCleaningUtility(df, logger=CleaningLogger(echo=False))
+
+
+def derived(state):
+    return (state.fill_values, state.drop_columns, state.median_age, state.date_fallbacks,
+            state.read_dtypes, state.name_mapping)
+
+
+@pytest.mark.parametrize('statistics', [None, CleaningStatistics])
+def test_save_load_round_trip(history, tmp_path, statistics):
+    state = cleaner(history).fit(statistics=statistics() if statistics else None)
+    filename = str(tmp_path / 'state.json.gz')
+    state.save(filename)
+    loaded = CleaningState.load(filename)
+    
+    assert type(loaded.stats) is type(state.stats)
+    assert derived(loaded) == derived(state)
+    batch = history.sample(500, random_state=0)
+    assert cleaner(batch).transform(state).equals(cleaner(batch).transform(loaded))
+
+
+def test_fit_defaults_to_fixed_size_state(history, tmp_path):
+    sizes = []
+    for rows in (1000, 4000):
+        state = cleaner(history.iloc[:rows]).fit()
+        state.save(str(tmp_path / f'state_{rows}.json.gz'))
+        sizes.append((tmp_path / f'state_{rows}.json.gz').stat().st_size)
+    assert isinstance(state.stats, SketchStatistics)
+    assert sizes[1] < 1.5 * sizes[0]
+
+
+def test_exact_state_keeps_only_used_counts(history, tmp_path):
+    state = cleaner(history).fit(statistics=CleaningStatistics())
+    state.save(str(tmp_path / 'state.json'))
+    with open(tmp_path / 'state.json', encoding='utf-8') as f:
+        saved = json.load(f)['stats']
+    assert 'Customer ID' not in saved['value_counts']
+    assert set(saved['value_counts']) <= set(state.fill_values) | {'age', 'Registration Date'}
+
+
+def test_merge_equals_fit_on_all_rows(history):
+    first, second = history.iloc[:2500], history.iloc[2500:]
+    whole = cleaner(history).fit(statistics=CleaningStatistics())
+    merged = cleaner(first).fit(statistics=CleaningStatistics())
+    merged.merge(cleaner(second).fit(statistics=CleaningStatistics()))
+    incremental = cleaner(first).fit(statistics=CleaningStatistics())
+    cleaner(second).fit(state=incremental)
+    
+    assert merged.stats.total_rows == incremental.stats.total_rows == len(history)
+    assert derived(merged) == derived(whole)
+    assert derived(incremental) == derived(whole)
+
+
+def test_sketch_merge_matches_counts(history):
+    first, second = history.iloc[:2500], history.iloc[2500:]
+    merged = cleaner(first).fit().merge(cleaner(second).fit())
+    assert merged.stats.total_rows == len(history)
+    assert merged.stats.null_counts == history.isnull().sum().to_dict()
+    assert merged.drop_columns == cleaner(history).fit().drop_columns
+
+
+def test_load_prunes_older_state_files(history, tmp_path):
+    stats = cleaner(history).fit(statistics=CleaningStatistics()).stats
+    counts = {col: {str(value): int(count) for value, count in history[col].astype(str)[history[col].notnull()].value_counts().items()}
+              for col in history.columns}
+    old = {'version': 1, 'strategy': 'smart',
+           'stats': {'kind': 'exact', 'total_rows': len(history), 'columns': list(history.columns),
+                     'null_counts': stats.null_counts, 'value_counts': counts}}
+    with gzip.open(tmp_path / 'old.json.gz', 'wt', encoding='utf-8') as f:
+        json.dump(old, f)
+    
+    loaded = CleaningState.load(str(tmp_path / 'old.json.gz'))
+    assert 'Customer ID' not in loaded.stats.value_counts
+    assert loaded.read_dtypes == {col: stats.read_dtype(col) for col in history.columns}
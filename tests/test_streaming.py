@@ -0,0 +1,84 @@
+"""Tests for out-of-core streaming: ChunkedDataCleaner and its statistics"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_cleaning_utility import (ChunkedDataCleaner, CleaningLogger, CleaningStatistics,
+                                   DataCleaningUtility, SketchStatistics, generate_synthetic_data)
+
+
+@pytest.fixture(scope='module')
+def dirty_csv(tmp_path_factory):
+    path = tmp_path_factory.mktemp('streaming') / 'dirty.csv'
+    return generate_synthetic_data(rows=300, missing_rate=0.05, duplicate_rate=0.1, seed=5,
+                                   output=str(path))
+
+
+def eager(path, subset, keep):
+    c = DataCleaningUtility(pd.read_csv(path), logger=CleaningLogger(echo=False))
+    c.handle_missing_values('smart')
+    c.fix_data_types()
+    c.remove_duplicates(subset=subset, keep=keep)
+    c.standardize_column_names()
+    c.standardize_text_data()
+    return c.get_cleaned_data()
+
+
+@pytest.mark.parametrize('keep', ['first', 'last', False])
+@pytest.mark.parametrize('subset', [['Customer ID'], None])
+def test_exact_streaming_matches_eager(dirty_csv, tmp_path, subset, keep):
+    expected = tmp_path / 'eager.csv'
+    eager(dirty_csv, subset, keep).to_csv(expected, index=False)
+    for chunksize in (7, 50, 1000):
+        output = tmp_path / f'stream_{chunksize}.csv'
+        cleaner = ChunkedDataCleaner(dirty_csv, chunksize=chunksize, subset=subset, keep=keep,
+                                     logger=CleaningLogger(echo=False), statistics=CleaningStatistics())
+        cleaner.clean_to_csv(str(output))
+        assert output.read_text() == expected.read_text()
+
+
+def test_streaming_defaults_to_bounded_statistics(dirty_csv, tmp_path):
+    cleaner = ChunkedDataCleaner(dirty_csv, chunksize=100, subset=['Customer ID'],
+                                 logger=CleaningLogger(echo=False))
+    rows = cleaner.clean_to_csv(str(tmp_path / 'out.csv'))
+    assert isinstance(cleaner.stats, SketchStatistics)
+    assert rows == len(pd.read_csv(tmp_path / 'out.csv'))
+    assert any('rank error' in str(entry) for entry in cleaner.cleaning_log)
+
+
+def test_exact_statistics_skip_complete_columns():
+    df = generate_synthetic_data(rows=2000, missing_rate=0, seed=1).astype(str)
+    df.loc[1500, 'Email Address'] = np.nan
+    stats = CleaningStatistics()
+    for start in range(0, len(df), 500):
+        stats.update(df.iloc[start:start + 500])
+    
+    # IDs and other complete columns are never counted
+    assert sorted(stats.value_counts) == ['Email Address', 'Registration Date', 'age']
+    assert stats.read_dtype('Customer ID') == 'int64'
+    assert stats.read_dtype('Email Address') == object
+    assert stats.uncounted_rows == {'Email Address': 1500}
+    
+    # Backfilling the first rows gives the counts of a single pass
+    stats.backfill(df[['Email Address']].iloc[start:start + 500] for start in range(0, len(df), 500))
+    single = CleaningStatistics()
+    single.update(df)
+    assert stats.value_counts == single.value_counts
+    assert stats.null_counts == single.null_counts
+    assert stats.uncounted_rows == {}
+
+
+def test_exact_statistics_merge_tracks_uncounted_rows():
+    first = pd.DataFrame({'email': ['a', 'b', 'a'], 'age': ['30', '40', '50']})
+    second = pd.DataFrame({'email': [None, 'c'], 'age': ['30', None]})
+    left, right = CleaningStatistics(), CleaningStatistics()
+    left.update(first)
+    right.update(second)
+    merged = CleaningStatistics.from_dict(left.merge(right).to_dict())
+    
+    assert merged.total_rows == 5
+    assert merged.uncounted_rows == {'email': 3}
+    assert merged.counts('age').to_dict() == {'30': 2, '40': 1, '50': 1}
+    assert merged.median('age') == 35.0
+    assert 'from the last 2 of 5 rows' in merged.error_note('email', 'mode')